@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 
 class SimulationMode(Enum):
@@ -23,6 +24,10 @@ class Settings:
         use_optimizer: Whether to use optimization for scheduling
         power_limit_mode: Whether to enforce contracted power limit without optimization (baseline mode)
         trip_schedule: Trip departure times as (hour_utc, slot_index) per day, e.g. ((9, 0), (14, 1))
+        random_seed: Seed for daily trip selection; None keeps runs non-deterministic
+        skip_unchanged_measurements: Only store a measurement when its value changes; consumers
+            must forward-fill each source/metric series to get a value per timestep
+        final_dump_path: Copy the database to this file when the run ends (use with db_path=":memory:")
     """
 
     timestep: int = 900  # Default: 15 minutes
@@ -32,6 +37,9 @@ class Settings:
     power_limit_mode: bool = False  # Default: no power limiting (unlimited charging)
     # Trip schedule: list of (hour_utc, slot_index), e.g. 9:00 slot 0, 14:00 slot 1
     trip_schedule: tuple = ((9, 0), (14, 1))
+    random_seed: Optional[int] = None  # Default: different trips every run
+    skip_unchanged_measurements: bool = False  # Default: one row per timestep (KPI scripts sum rows)
+    final_dump_path: Optional[str] = None  # Default: results stay in db_path only
 
     def __post_init__(self):
         """Validate settings."""
@@ -61,14 +61,21 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._connection: Optional[sqlite3.Connection] = None
+        # Open get_connection blocks on the persistent connection
+        self._connection_depth = 0
         # Cache for source and metric IDs to avoid repeated lookups
         self._source_cache: dict[str, int] = {}
         self._metric_cache: dict[str, int] = {}
 
+        # An in-memory database only lives as long as its connection
+        if db_path == ":memory:":
+            self.connect()
+
     def connect(self):
-        """Establish database connection."""
+        """Establish a persistent connection, reused by get_connection until close()."""
         self._connection = sqlite3.connect(self.db_path)
         self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA foreign_keys = ON")
 
     def close(self):
         """Close database connection."""
@@ -78,18 +85,37 @@ class DatabaseManager:
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
+        """
+        Context manager for database connection.
+
+        Without connect(), each block opens, commits and closes its own
+        connection. After connect() (always for ":memory:"), every block shares
+        the persistent connection; nested blocks then join the outermost one's
+        transaction, which alone commits or rolls back.
+        """
+        persistent = self._connection is not None
+        if persistent:
+            conn = self._connection
+            self._connection_depth += 1
+            outermost = self._connection_depth == 1
+        else:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            outermost = True
         try:
             yield conn
-            conn.commit()
+            if outermost:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if outermost:
+                conn.rollback()
             raise e
         finally:
-            conn.close()
+            if persistent:
+                self._connection_depth -= 1
+            else:
+                conn.close()
 
     def initialize_schema(self):
         """Create database tables for simulation data."""
@@ -134,25 +160,13 @@ class DatabaseManager:
             """
             )
 
-            # Create indexes for measurements
+            # Time index for measurements; source lookups use the composite indexes below
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_measurements_timestamp 
                 ON measurements(timestamp)
             """
             )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_measurements_source_id 
-                ON measurements(source_id)
-            """
-            )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_measurements_metric_id 
-                ON measurements(metric_id)
-            """
-            )
 
             # Forecast table - for predicted/forecasted data
             cursor.execute(
@@ -169,25 +183,13 @@ class DatabaseManager:
             """
             )
 
-            # Create indexes for forecast
+            # Time index for forecast
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_forecast_timestamp 
                 ON forecast(timestamp)
             """
             )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_forecast_source_id 
-                ON forecast(source_id)
-            """
-            )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_forecast_metric_id 
-                ON forecast(metric_id)
-            """
-            )
 
             # Scheduling table - for scheduled events/commands
             cursor.execute(
@@ -204,27 +206,105 @@ class DatabaseManager:
             """
             )
 
-            # Create indexes for scheduling
+            # Time index for scheduling
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_scheduling_timestamp 
                 ON scheduling(timestamp)
             """
             )
+
+            self._create_composite_indexes(cursor, VALID_TABLES)
+
+            conn.commit()
+
+    @staticmethod
+    def _create_composite_indexes(cursor, tables):
+        """Create the composite indexes on the given data tables."""
+        for table in tables:
+            # Composite index so per-source time range queries seek instead of scan
             cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_scheduling_source_id 
-                ON scheduling(source_id)
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_source_timestamp
+                ON {table}(source_id, timestamp)
             """
             )
+            # Covering index for the viewer's source/metric/time query
             cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_scheduling_metric_id 
-                ON scheduling(metric_id)
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_cover
+                ON {table}(source_id, metric_id, timestamp, value)
             """
             )
 
-            conn.commit()
+    @staticmethod
+    def missing_composite_indexes(conn) -> List[str]:
+        """
+        List the composite indexes missing on the data tables a database has.
+
+        Only reads the schema, so any connection works, including read-only ones.
+
+        Args:
+            conn: Open sqlite3 connection to the database
+
+        Returns:
+            Names of the missing indexes (empty for an up-to-date database)
+        """
+        names = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+            )
+        }
+        return [
+            name
+            for table in VALID_TABLES
+            if table in names
+            for name in (f"idx_{table}_source_timestamp", f"idx_{table}_cover")
+            if name not in names
+        ]
+
+    def backfill_indexes(self):
+        """
+        Add the composite indexes to a database written by an older version.
+
+        Only data tables that already exist are indexed; no tables are created,
+        so databases from other tools are left untouched. A database that
+        already has every index is not written to at all. Planner statistics
+        are gathered if the database has none yet.
+        """
+        with self.get_connection() as conn:
+            if not self.missing_composite_indexes(conn):
+                return
+            existing = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            tables = [table for table in VALID_TABLES if table in existing]
+            self._create_composite_indexes(conn.cursor(), tables)
+            if "sqlite_stat1" not in existing:
+                conn.execute("ANALYZE")
+
+    def analyze(self):
+        """Refresh the query planner statistics (run after bulk loads)."""
+        with self.get_connection() as conn:
+            conn.execute("ANALYZE")
+
+    def backup(self, target_path: str):
+        """
+        Copy the whole database to a file (e.g. an in-memory run to disk).
+
+        Args:
+            target_path: Path of the SQLite file to write (replaced if it exists)
+        """
+        target = sqlite3.connect(target_path)
+        try:
+            with self.get_connection() as conn:
+                conn.backup(target)
+        finally:
+            target.close()
 
     def initialize_default_metrics(self):
         """
@@ -318,7 +398,7 @@ class DatabaseManager:
             end_time: Filter by end timestamp ISO string (optional)
 
         Returns:
-            List of records
+            List of records, by timestamp and then insertion order
         """
         self._validate_table(table)
         query = f"SELECT * FROM {table} WHERE 1=1"
@@ -340,7 +420,8 @@ class DatabaseManager:
             query += " AND timestamp <= ?"
             params.append(end_time)
 
-        query += " ORDER BY timestamp"
+        # Rows sharing a timestamp come back in insertion order
+        query += " ORDER BY timestamp, measurement_id"
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
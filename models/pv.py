@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import pvlib
 
 # Constants for DC power model
@@ -12,6 +13,22 @@ SAPM_TEMP_PARAMS = pvlib.temperature.TEMPERATURE_MODEL_PARAMETERS["sapm"][
 ]
 
 
+@lru_cache(maxsize=4096)
+def _solar_position(timestamp, latitude: float, longitude: float) -> tuple:
+    """
+    Apparent elevation, zenith and azimuth (degrees) of the sun.
+
+    Memoized because the forecaster and the engine both evaluate every
+    timestep, and every PV system at a port shares the same location.
+    """
+    solpos = pvlib.solarposition.get_solarposition(timestamp, latitude, longitude)
+    return (
+        solpos["apparent_elevation"].iloc[0],
+        solpos["zenith"].iloc[0],
+        solpos["azimuth"].iloc[0],
+    )
+
+
 @dataclass
 class PV:
     name: str
@@ -44,19 +61,19 @@ class PV:
         wind_speed: float = 1.0,  # m/s (assumed to be 1 m/s)
     ) -> float:
 
-        solpos = pvlib.solarposition.get_solarposition(
+        elevation, zenith, azimuth = _solar_position(
             timestamp, self.latitude, self.longitude
         )
 
-        if solpos["apparent_elevation"].iloc[0] <= 0:
+        if elevation <= 0:
             self.current_production = 0.0
             return 0.0
 
         poa = pvlib.irradiance.get_total_irradiance(
             surface_tilt=self.tilt,
             surface_azimuth=self.azimuth,
-            solar_zenith=solpos["zenith"].iloc[0],
-            solar_azimuth=solpos["azimuth"].iloc[0],
+            solar_zenith=zenith,
+            solar_azimuth=azimuth,
             dni=dni,
             ghi=ghi,
             dhi=dhi,
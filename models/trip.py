@@ -1,10 +1,11 @@
 """Trip model for boat routes."""
 
 import csv
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -48,6 +49,13 @@ class Trip:
         else:
             self.duration = 0
 
+        # Offset of every point from the start, for bisecting by elapsed time
+        self._offsets: List[timedelta] = [
+            point.timestamp - self.points[0].timestamp for point in self.points
+        ]
+        # Energy estimates per boat k factor; trips are read-only once loaded
+        self._energy_cache: Dict[float, float] = {}
+
     def _load_from_csv(self, csv_path: str):
         """Load trip points from CSV file."""
         with open(csv_path, "r") as f:
@@ -110,23 +118,17 @@ class Trip:
         if not self.points or elapsed_seconds > self.duration:
             return None
 
-        # Find the closest point by time
-        target_time = self.points[0].timestamp + timedelta(seconds=elapsed_seconds)
-
-        # Binary search would be more efficient, but linear is fine for our data size
-        closest_point = self.points[0]
-        min_diff = abs((target_time - closest_point.timestamp).total_seconds())
-
-        for point in self.points[1:]:
-            diff = abs((target_time - point.timestamp).total_seconds())
-            if diff < min_diff:
-                min_diff = diff
-                closest_point = point
-            else:
-                # Points are sorted, so we can stop once diff starts increasing
-                break
-
-        return closest_point
+        # Find the closest point by time (points are sorted by timestamp);
+        # on a tie the earlier point wins
+        target = timedelta(seconds=elapsed_seconds)
+        i = bisect_left(self._offsets, target)
+        if i == 0:
+            return self.points[0]
+        if i == len(self.points):
+            return self.points[-1]
+        if self._offsets[i] - target < target - self._offsets[i - 1]:
+            return self.points[i]
+        return self.points[i - 1]
 
     def estimate_energy_required(self, boat_k_factor: float) -> float:
         """
@@ -141,6 +143,10 @@ class Trip:
         if not self.points:
             return 0.0
 
+        cached = self._energy_cache.get(boat_k_factor)
+        if cached is not None:
+            return cached
+
         # Sum up energy for each segment based on speed
         total_energy = 0.0
         for i in range(len(self.points) - 1):
@@ -161,6 +167,7 @@ class Trip:
 
             total_energy += energy_kwh
 
+        self._energy_cache[boat_k_factor] = total_energy
         return total_energy
 
     def __repr__(self) -> str:
@@ -2,9 +2,9 @@
 
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, List, Union
+from typing import Optional, Dict, List, Tuple, Union
 
-from models import Port, BoatState, ChargerState, Trip
+from models import Port, Boat, BoatState, Charger, ChargerState, Trip
 from database import DatabaseManager
 from config import Settings, SimulationMode
 from simulation.trip_manager import TripManager
@@ -12,6 +12,9 @@ from weather import OpenMeteoClient
 from forecasting import PortForecaster
 from optimization import BaseOptimizer
 
+# Measurement rows buffered before a batch mode flush to the database
+MEASUREMENT_FLUSH_SIZE = 10_000
+
 
 class SimulationEngine:
     """Main simulation engine for the electric port."""
@@ -62,12 +65,20 @@ class SimulationEngine:
         # Track boat-charger assignments
         self.boat_charger_map = {}  # {boat_name: charger_name}
 
+        # Name lookups for the port's fleet (first entry wins on duplicate names)
+        self.boats_by_name: Dict[str, Boat] = {}
+        for boat in port.boats:
+            self.boats_by_name.setdefault(boat.name, boat)
+        self.chargers_by_name: Dict[str, Charger] = {}
+        for charger in port.chargers:
+            self.chargers_by_name.setdefault(charger.name, charger)
+
         # Trip schedule from settings: (start_hour, slot_number)
         self.trip_schedule = self.settings.trip_schedule
 
         # Initialize trip manager
         print(f"\nLoading trips from {trips_directory}...")
-        self.trip_manager = TripManager(trips_directory)
+        self.trip_manager = TripManager(trips_directory, seed=settings.random_seed)
 
         # Track active trips: {boat_name: (trip, start_datetime, elapsed_seconds)}
         self.active_trips: Dict[str, tuple[Trip, datetime, float]] = {}
@@ -102,6 +113,12 @@ class SimulationEngine:
         # Track boats with energy shortfalls (for priority charging)
         self.boats_with_shortfalls = set()  # {boat_name}
 
+        # Measurement rows not yet written: (timestamp, source_id, metric_id, value)
+        self.pending_measurements: List[Tuple[str, int, int, str]] = []
+
+        # Last stored value per (source_id, metric_id), for skip_unchanged_measurements
+        self.last_measurement_values: Dict[Tuple[int, int], str] = {}
+
         # Initialize weather client and fetch forecast if PV systems present
         self.weather_client = None
         self.weather_forecast = {}  # {timestamp_str: {metric: value}}
@@ -130,10 +147,27 @@ class SimulationEngine:
         print(f"Chargers: {len(self.port.chargers)}")
         print("=" * 60 + "\n")
 
-        if self.settings.mode == SimulationMode.BATCH:
-            self._run_batch()
-        else:
-            self._run_realtime()
+        try:
+            if self.settings.mode == SimulationMode.BATCH:
+                self._run_batch()
+            else:
+                self._run_realtime()
+        except BaseException:
+            # Keep the steps simulated so far, but never let a failing flush
+            # replace the error that stopped the run
+            try:
+                self._flush_measurements()
+            except Exception as e:
+                print(f"  Warning: Failed to write buffered measurements: {e}")
+            raise
+        self._flush_measurements()
+
+        # Update planner statistics now that the bulk of the rows is written
+        self.db_manager.analyze()
+
+        # Persist an in-memory (or scratch) database for the KPI scripts
+        if self.settings.final_dump_path:
+            self.db_manager.backup(self.settings.final_dump_path)
 
     def _run_batch(self):
         """Run simulation in batch mode (all timesteps at once)."""
@@ -391,7 +425,7 @@ class SimulationEngine:
 
         # For each boat with shortfall, try to maximize charging
         for boat_name, shortfall_kwh in result.energy_shortfalls.items():
-            boat = next(b for b in self.port.boats if b.name == boat_name)
+            boat = self.boats_by_name[boat_name]
             shortfall_pct = (shortfall_kwh / boat.battery_capacity) * 100
 
             print(
@@ -516,9 +550,7 @@ class SimulationEngine:
                     # Disconnect from charger if connected
                     if boat_name in self.boat_charger_map:
                         charger_name = self.boat_charger_map[boat_name]
-                        charger = next(
-                            c for c in self.port.chargers if c.name == charger_name
-                        )
+                        charger = self.chargers_by_name[charger_name]
                         charger.state = ChargerState.IDLE
                         charger.power = 0.0
                         charger.connected_boat = None
@@ -565,9 +597,7 @@ class SimulationEngine:
                         # Disconnect from charger if connected
                         if boat_name in self.boat_charger_map:
                             charger_name = self.boat_charger_map[boat_name]
-                            charger = next(
-                                c for c in self.port.chargers if c.name == charger_name
-                            )
+                            charger = self.chargers_by_name[charger_name]
                             charger.state = ChargerState.IDLE
                             charger.power = 0.0
                             charger.connected_boat = None
@@ -663,19 +693,7 @@ class SimulationEngine:
         # ------------------------------------------------------------------
         # Load scheduled charger powers for THIS timestep
         # ------------------------------------------------------------------
-        scheduled_power = {}  # charger_name -> power_kW
-        power_setpoint_met = self.db_manager.get_metric_id("power_setpoint")
-
-        for charger in self.port.chargers:
-            src = self.db_manager.get_or_create_source(charger.name, "charger")
-            rows = self.db_manager.get_records(
-                table="scheduling",
-                source_id=src,
-                metric_id=power_setpoint_met,
-                start_time=ts_str,
-                end_time=ts_str,
-            )
-            scheduled_power[charger.name] = float(rows[0]["value"]) if rows else 0.0
+        scheduled_power = self._get_scheduled_charger_power(ts_str)
 
         # ------------------------------------------------------------------
         # Build current charger ↔ boat mapping
@@ -691,9 +709,7 @@ class SimulationEngine:
 
         # Remove stale mappings
         for boat_name, charger_name in list(self.boat_charger_map.items()):
-            charger = next(
-                (c for c in self.port.chargers if c.name == charger_name), None
-            )
+            charger = self.chargers_by_name.get(charger_name)
             if not charger or charger.connected_boat != boat_name:
                 self.boat_charger_map.pop(boat_name, None)
 
@@ -701,10 +717,10 @@ class SimulationEngine:
         # FIX 1 — Force disconnect boats that are already fully charged
         # ------------------------------------------------------------------
         for boat_name, charger_name in list(boat_to_charger.items()):
-            boat = next(b for b in self.port.boats if b.name == boat_name)
+            boat = self.boats_by_name[boat_name]
 
             if boat.soc >= 0.99:
-                charger = next(c for c in self.port.chargers if c.name == charger_name)
+                charger = self.chargers_by_name[charger_name]
 
                 charger.state = ChargerState.IDLE
                 charger.power = 0.0
@@ -766,7 +782,7 @@ class SimulationEngine:
             # Already charging → just update power
             if boat.name in boat_to_charger:
                 charger_name = boat_to_charger[boat.name]
-                charger = next(c for c in self.port.chargers if c.name == charger_name)
+                charger = self.chargers_by_name[charger_name]
 
                 charger.power = min(
                     scheduled_power.get(charger.name, 0.0),
@@ -801,6 +817,37 @@ class SimulationEngine:
             boat_to_charger[boat.name] = free_charger.name
             self.boat_charger_map[boat.name] = free_charger.name
 
+    def _get_scheduled_charger_power(self, ts_str: str) -> Dict[str, float]:
+        """
+        Get every charger's scheduled power for a timestep.
+
+        Args:
+            ts_str: Timestep as a "YYYY-MM-DD HH:MM:SS" string
+
+        Returns:
+            Dict of charger_name -> power_kW; 0 kW for chargers without a setpoint
+        """
+        power_setpoint_met = self.db_manager.get_metric_id("power_setpoint")
+
+        # One query for every source's setpoint at this timestep. Rows come
+        # back in insertion order, so if a source has more than one row the
+        # first one written wins, as with the former per-source queries
+        rows = self.db_manager.get_records(
+            table="scheduling",
+            metric_id=power_setpoint_met,
+            start_time=ts_str,
+            end_time=ts_str,
+        )
+        setpoints = {}  # source_id -> power_kW
+        for row in rows:
+            setpoints.setdefault(row["source_id"], float(row["value"]))
+
+        scheduled_power = {}
+        for charger in self.port.chargers:
+            src = self.db_manager.get_or_create_source(charger.name, "charger")
+            scheduled_power[charger.name] = setpoints.get(src, 0.0)
+        return scheduled_power
+
     def _override_schedules_for_shortfall_boat(self, boat_name: str, result):
         """
         Override schedules to maximize charging for a boat with energy shortfall.
@@ -816,9 +863,7 @@ class SimulationEngine:
         assigned_charger = None
         if boat_name in self.boat_charger_map:
             charger_name = self.boat_charger_map[boat_name]
-            assigned_charger = next(
-                c for c in self.port.chargers if c.name == charger_name
-            )
+            assigned_charger = self.chargers_by_name[charger_name]
 
         # Update schedules to use maximum power for this boat's charger
         # when boat is available
@@ -994,16 +1039,20 @@ class SimulationEngine:
             # Need to reduce power proportionally
             scale_factor = max_total_power / total_power_used
 
-            for boat_name, charger_name in self.boat_charger_map.items():
-                charger = next(c for c in self.port.chargers if c.name == charger_name)
-                if charger.state == ChargerState.CHARGING:
+            # One pass over the chargers instead of a name search per mapping
+            mapped_chargers = set(self.boat_charger_map.values())
+            for charger in self.port.chargers:
+                if (
+                    charger.name in mapped_chargers
+                    and charger.state == ChargerState.CHARGING
+                ):
                     charger.power = charger.power * scale_factor
 
     def _update_charging(self):
         """Update battery charge for boats that are charging."""
         for boat_name, charger_name in list(self.boat_charger_map.items()):
-            boat = next(b for b in self.port.boats if b.name == boat_name)
-            charger = next(c for c in self.port.chargers if c.name == charger_name)
+            boat = self.boats_by_name[boat_name]
+            charger = self.chargers_by_name[charger_name]
 
             # Calculate energy delivered to battery in this timestep
             effective_power = charger.effective_power  # kW
@@ -1301,9 +1350,18 @@ class SimulationEngine:
                 # Expensive period or boats charging - idle
                 bess.idle()
 
+    def _flush_measurements(self):
+        """Write buffered measurement rows in a single transaction."""
+        if self.pending_measurements:
+            self.db_manager.save_records_batch(
+                "measurements", self.pending_measurements
+            )
+            self.pending_measurements = []
+
     def _save_measurements(self):
         """Save current state to database."""
-        measurements = []
+        measurements = self.pending_measurements
+        first_new = len(measurements)
 
         # Convert current datetime to ISO format string (UTC)
         timestamp_str = self.current_datetime.strftime("%Y-%m-%d %H:%M:%S")
@@ -1483,5 +1541,20 @@ class SimulationEngine:
                 )
             )
 
-        # Save to database
-        self.db_manager.save_records_batch("measurements", measurements)
+        # Drop rows whose value has not changed since the last stored one
+        if self.settings.skip_unchanged_measurements:
+            new_rows = measurements[first_new:]
+            del measurements[first_new:]
+            for row in new_rows:
+                key = (row[1], row[2])
+                if self.last_measurement_values.get(key) != row[3]:
+                    self.last_measurement_values[key] = row[3]
+                    measurements.append(row)
+
+        # Save to database: every step in real-time mode so viewers stay live,
+        # otherwise in large batches to avoid a transaction per timestep
+        if (
+            self.settings.mode != SimulationMode.BATCH
+            or len(measurements) >= MEASUREMENT_FLUSH_SIZE
+        ):
+            self._flush_measurements()
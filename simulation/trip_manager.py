@@ -1,6 +1,7 @@
 """Trip management for the simulation."""
 
 import random
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
@@ -8,23 +9,39 @@ from datetime import datetime
 from models.trip import Trip
 
 
+@lru_cache(maxsize=None)
+def _load_trip(csv_path: str, mtime: float) -> Trip:
+    """
+    Parse a trip CSV, memoized per file path and modification time.
+
+    Trips are read-only once loaded, so every TripManager in the process can
+    share the parsed objects; editing a CSV changes its mtime and forces a reload.
+    """
+    return Trip(csv_path)
+
+
 class TripManager:
     """Manages trip assignments and loading for boats."""
 
-    def __init__(self, trips_directory: str = "assets/trips"):
+    def __init__(self, trips_directory: str = "assets/trips", seed: Optional[int] = None):
         """
         Initialize the trip manager.
 
         Args:
             trips_directory: Directory containing trip CSV files
+            seed: Seed for trip selection (None = non-deterministic)
         """
         self.trips_directory = Path(trips_directory)
+        self.seed = seed
+        # Independent random generator per boat: {boat_name: Random}
+        self._rngs: Dict[str, random.Random] = {}
         self.available_trips: List[Trip] = []
         self._load_trips()
 
-        # Track assigned trips per boat per day
-        # {boat_name: {date_str: [trip1, trip2, ...]}}
-        self.daily_assignments: Dict[str, Dict[str, List[Trip]]] = {}
+        # Track assigned trips per boat per day, keyed by date ordinal
+        # (cheaper than formatting a date string on every lookup)
+        # {boat_name: {date_ordinal: [trip1, trip2, ...]}}
+        self.daily_assignments: Dict[str, Dict[int, List[Trip]]] = {}
 
     def _load_trips(self):
         """Load all available trip CSV files."""
@@ -35,7 +52,7 @@ class TripManager:
         csv_files = list(self.trips_directory.glob("route_*.csv"))
         for csv_file in sorted(csv_files):
             try:
-                trip = Trip(str(csv_file))
+                trip = _load_trip(str(csv_file), csv_file.stat().st_mtime)
                 if trip.points:  # Only add trips with valid data
                     self.available_trips.append(trip)
                     print(f"  Loaded {trip.route_name}: {len(trip.points)} points, {trip.duration/3600:.2f}h")
@@ -47,6 +64,18 @@ class TripManager:
         else:
             print("  Warning: No trips loaded!")
 
+    def _get_rng(self, boat_name: str) -> random.Random:
+        """Get (or lazily create) the random generator for a boat."""
+        rng = self._rngs.get(boat_name)
+        if rng is None:
+            # String seeds are hashed deterministically by random.Random,
+            # unlike hash(), which is salted per process
+            rng = random.Random(
+                f"{self.seed}:{boat_name}" if self.seed is not None else None
+            )
+            self._rngs[boat_name] = rng
+        return rng
+
     def assign_daily_trips(self, boat_name: str, current_date: datetime) -> List[Trip]:
         """
         Assign trips for a boat for the given day.
@@ -61,13 +90,13 @@ class TripManager:
         if not self.available_trips:
             return []
 
-        date_str = current_date.strftime("%Y-%m-%d")
+        date_key = current_date.toordinal()
         weekday = current_date.weekday()  # 0=Monday, 6=Sunday
 
         # Check if already assigned for this day
         if boat_name in self.daily_assignments:
-            if date_str in self.daily_assignments[boat_name]:
-                return self.daily_assignments[boat_name][date_str]
+            if date_key in self.daily_assignments[boat_name]:
+                return self.daily_assignments[boat_name][date_key]
 
         # Determine number of trips based on day of week
         if weekday < 5:  # Monday-Friday
@@ -80,16 +109,17 @@ class TripManager:
         # Randomly select trips from available trips
         assigned_trips = []
         if num_trips > 0:
+            rng = self._get_rng(boat_name)
             # Allow repetition if we have fewer routes than needed trips
             if num_trips <= len(self.available_trips):
-                assigned_trips = random.sample(self.available_trips, num_trips)
+                assigned_trips = rng.sample(self.available_trips, num_trips)
             else:
-                assigned_trips = random.choices(self.available_trips, k=num_trips)
+                assigned_trips = rng.choices(self.available_trips, k=num_trips)
 
         # Store assignment
         if boat_name not in self.daily_assignments:
             self.daily_assignments[boat_name] = {}
-        self.daily_assignments[boat_name][date_str] = assigned_trips
+        self.daily_assignments[boat_name][date_key] = assigned_trips
 
         return assigned_trips
 
@@ -107,15 +137,15 @@ class TripManager:
         Returns:
             The assigned trip, or None if no trip for this slot
         """
-        date_str = current_date.strftime("%Y-%m-%d")
+        date_key = current_date.toordinal()
 
         if boat_name not in self.daily_assignments:
             return None
 
-        if date_str not in self.daily_assignments[boat_name]:
+        if date_key not in self.daily_assignments[boat_name]:
             return None
 
-        trips = self.daily_assignments[boat_name][date_str]
+        trips = self.daily_assignments[boat_name][date_key]
         if slot < len(trips):
             return trips[slot]
 
@@ -134,13 +164,13 @@ class TripManager:
         Returns:
             List of trips assigned for this date (may be empty)
         """
-        date_str = current_date.strftime("%Y-%m-%d")
+        date_key = current_date.toordinal()
         
         if boat_name not in self.daily_assignments:
             return []
         
-        if date_str not in self.daily_assignments[boat_name]:
+        if date_key not in self.daily_assignments[boat_name]:
             return []
         
-        return self.daily_assignments[boat_name][date_str]
+        return self.daily_assignments[boat_name][date_key]
 
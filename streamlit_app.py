@@ -1,17 +1,60 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+import io
+import json
 from pathlib import Path
 import sqlite3
 
+import numpy as np
 import pandas as pd
+import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import streamlit as st
 
+from database import DatabaseManager
+
 # -----------------------
 # Config
 # -----------------------
 
 DATA_TABLES = ("measurements", "forecast", "scheduling")
 
+# Format the simulator stores timestamps in (see SimulationEngine)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Series longer than this are thinned before plotting (screens are ~2000px wide)
+DOWNSAMPLE_THRESHOLD = 5000
+MAX_POINTS_PER_SERIES = 2000
+# MinMaxLTTB: LTTB only runs on the per-bucket extrema of this many points
+MINMAX_RATIO = 4
+# Without a legend, more series than this are drawn as one gap-separated trace
+MAX_TRACES = 50
+
+# Layout shared by every Explore plot; only showlegend varies per call
+PLOT_LAYOUT = dict(
+    xaxis_title="Time",
+    yaxis_title="Value",
+    hovermode="x unified",
+    height=500,
+    legend_title_text="",
+    legend=dict(orientation="h", y=1.02),
+    margin=dict(l=10, r=10, t=40, b=10),
+)
+
+# Plot resolutions; anything but raw is aggregated per time bucket in SQLite
+RESOLUTIONS = {"Raw": None, "15 min": 900, "1 hour": 3600, "1 day": 86400}
+
+# Stored value as a number, NULL (NaN, skipped by AVG/MIN/MAX) when it is not
+# one; a bare CAST would turn text into 0.0
+NUMERIC_VALUE = """
+    CASE
+        WHEN typeof(d.value) IN ('integer', 'real') OR d.value GLOB '[0-9.-]*'
+        THEN CAST(d.value AS REAL)
+    END
+"""
+
 st.set_page_config(
     page_title="Port Simulation Viewer",
     page_icon="⚓",
@@ -23,18 +66,56 @@ st.set_page_config(
 # -----------------------
 
 
+@st.cache_resource(max_entries=16)
+def open_connection(db_path: str, inode: int):
+    # One persistent read-only connection per database file keeps SQLite's
+    # page cache warm across reruns instead of reopening it for every query
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(
+        uri, uri=True, check_same_thread=False, cached_statements=256
+    )
+    conn.execute("PRAGMA query_only = 1")
+    # Sorts for ORDER BY stay in memory; reads go through a 256 MiB mmap
+    # window and a 64 MiB page cache
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -65536")
+    return conn
+
+
 def connect(db_path: str):
-    return sqlite3.connect(db_path)
+    # Keyed on the inode as well, so a database deleted and regenerated at the
+    # same path gets a new connection instead of reading the unlinked file
+    return open_connection(db_path, Path(db_path).stat().st_ino)
 
 
-@st.cache_data
-def get_db_files():
+def db_dir_version() -> float:
+    # A directory's mtime changes whenever an entry is added, removed or
+    # renamed, so it keys the listing below without re-globbing every rerun
+    return Path(__file__).parent.stat().st_mtime
+
+
+@st.cache_data(max_entries=1)
+def get_db_files(version: float):
     base = Path(__file__).parent
     return sorted([str(p.name) for p in base.glob("*.db")])
 
 
-@st.cache_data(ttl=5)
-def get_sources(db_path: str) -> pd.DataFrame:
+@st.cache_data
+def get_missing_indexes(db_path: str, version: float) -> list[str]:
+    with connect(db_path) as conn:
+        return DatabaseManager.missing_composite_indexes(conn)
+
+
+def db_version(db_path: str) -> float:
+    # Changes on every commit to the database (including its WAL, if any), so
+    # it can key the caches below instead of a short TTL
+    paths = (Path(db_path), Path(f"{db_path}-wal"))
+    return max(p.stat().st_mtime for p in paths if p.exists())
+
+
+@st.cache_data
+def get_sources(db_path: str, version: float) -> pd.DataFrame:
     with connect(db_path) as conn:
         return pd.read_sql_query(
             "SELECT source_id, source_name FROM source ORDER BY source_name",
@@ -42,8 +123,8 @@ def get_sources(db_path: str) -> pd.DataFrame:
         )
 
 
-@st.cache_data(ttl=5)
-def get_metrics(db_path: str) -> pd.DataFrame:
+@st.cache_data
+def get_metrics(db_path: str, version: float) -> pd.DataFrame:
     with connect(db_path) as conn:
         return pd.read_sql_query(
             "SELECT metric_id, metric_name, unit FROM metric ORDER BY metric_name",
@@ -51,18 +132,159 @@ def get_metrics(db_path: str) -> pd.DataFrame:
         )
 
 
-@st.cache_data(ttl=5)
+@st.cache_data
+def get_lookups(
+    db_path: str, version: float
+) -> tuple[dict[str, int], dict[str, int], dict[str, str]]:
+    # Name -> id (and metric -> unit) dicts for the widgets, in name order
+    sources = get_sources(db_path, version)
+    metrics = get_metrics(db_path, version)
+    return (
+        dict(zip(sources["source_name"], sources["source_id"].astype(int))),
+        dict(zip(metrics["metric_name"], metrics["metric_id"].astype(int))),
+        dict(zip(metrics["metric_name"], metrics["unit"])),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_data_query(
+    tables: tuple[str, ...],
+    has_sources: bool,
+    has_metrics: bool,
+    has_start: bool,
+    has_end: bool,
+    bucketed: bool = False,
+) -> str:
+    # Id lists are bound as one JSON array each, so the statement text does
+    # not depend on how many sources/metrics are selected
+    where = ""
+
+    if has_sources:
+        where += " AND d.source_id IN (SELECT value FROM json_each(?))"
+
+    if has_metrics:
+        where += " AND d.metric_id IN (SELECT value FROM json_each(?))"
+
+    if has_start:
+        where += " AND d.timestamp >= ?"
+
+    if has_end:
+        where += " AND d.timestamp < ?"
+
+    # One SELECT per table, tagged with its position in DATA_TABLES, so all
+    # tables come back from a single statement
+    selects = []
+    for table in tables:
+        if bucketed:
+            # Mean/min/max per series and bucket; the two bucket-size
+            # parameters come first, ahead of the WHERE clause ones
+            selects.append(
+                f"""
+                SELECT
+                    strftime(
+                        '%Y-%m-%d %H:%M:%S',
+                        CAST(strftime('%s', d.timestamp) AS INTEGER) / ? * ?,
+                        'unixepoch'
+                    ) AS timestamp,
+                    {DATA_TABLES.index(table)} AS table_code,
+                    d.source_id,
+                    d.metric_id,
+                    AVG({NUMERIC_VALUE}) AS value,
+                    MIN({NUMERIC_VALUE}) AS value_min,
+                    MAX({NUMERIC_VALUE}) AS value_max
+                FROM {table} d
+                WHERE 1=1 {where}
+                GROUP BY d.source_id, d.metric_id, 1
+            """
+            )
+        else:
+            selects.append(
+                f"""
+                SELECT
+                    d.timestamp,
+                    {DATA_TABLES.index(table)} AS table_code,
+                    d.source_id,
+                    d.metric_id,
+                    {NUMERIC_VALUE} AS value
+                FROM {table} d
+                WHERE 1=1 {where}
+            """
+            )
+
+    return " UNION ALL ".join(selects) + " ORDER BY 1"
+
+
+@st.cache_data(max_entries=32)  # Bounded: old versions pile up during a live run
 def load_data(
     db_path: str,
-    table: str,
+    version: float,
+    tables: tuple[str, ...],
     source_ids: list[int] | None,
     metric_ids: list[int] | None,
     start_time: str | None,
     end_time: str | None,
+    bucket_seconds: int | None = None,
 ) -> pd.DataFrame:
 
+    params = [
+        json.dumps([int(i) for i in ids])
+        for ids in (source_ids, metric_ids)
+        if ids
+    ]
+    params += filter(None, (start_time, end_time))
+    if bucket_seconds:
+        params = [bucket_seconds, bucket_seconds, *params]
+
+    q = load_data_query(
+        tables,
+        bool(source_ids),
+        bool(metric_ids),
+        bool(start_time),
+        bool(end_time),
+        bool(bucket_seconds),
+    )
+
+    # Stream in chunks so the driver never buffers every row as a tuple at
+    # once; values arrive as REAL or NULL, so no object-dtype inference is
+    # needed and non-numeric values stay NaN
+    value_columns = ("value", "value_min", "value_max") if bucket_seconds else ("value",)
+    with connect(db_path) as conn:
+        df = pd.concat(
+            pd.read_sql_query(
+                q,
+                conn,
+                params=params * len(tables),
+                chunksize=50_000,
+                dtype=dict.fromkeys(value_columns, "float64"),
+            ),
+            ignore_index=True,
+        )
+
+    # Resolve names from the small lookup tables instead of joining per row;
+    # categoricals keep a single copy of each string
+    sources = get_sources(db_path, version)
+    metrics = get_metrics(db_path, version)
+    source_codes = pd.Index(sources["source_id"]).get_indexer(df["source_id"])
+    metric_codes = pd.Index(metrics["metric_id"]).get_indexer(df["metric_id"])
+    units = metrics["unit"].astype("category")
+
+    return df.drop(columns=["table_code", "source_id", "metric_id"]).assign(
+        # Parsed once here (exact format, deduplicated) and cached typed
+        timestamp=pd.to_datetime(df["timestamp"], format=TIMESTAMP_FORMAT, cache=True),
+        table=pd.Categorical.from_codes(df["table_code"], DATA_TABLES),
+        source_name=pd.Categorical.from_codes(source_codes, sources["source_name"]),
+        metric_name=pd.Categorical.from_codes(metric_codes, metrics["metric_name"]),
+        unit=pd.Categorical.from_codes(
+            units.cat.codes.to_numpy()[metric_codes], units.cat.categories
+        ),
+    )
+
+
+@st.cache_data(max_entries=8)
+def load_raw(db_path: str, version: float, table: str, limit: int) -> pd.DataFrame:
     with connect(db_path) as conn:
-        q = f"""
+        return pd.read_sql_query(
+            f"""
             SELECT
                 d.timestamp,
                 s.source_name,
@@ -72,29 +294,25 @@ def load_data(
             FROM {table} d
             JOIN source s ON d.source_id = s.source_id
             JOIN metric m ON d.metric_id = m.metric_id
-            WHERE 1=1
-        """
-        params: list = []
-
-        if source_ids:
-            q += f" AND d.source_id IN ({','.join('?' * len(source_ids))})"
-            params.extend(source_ids)
-
-        if metric_ids:
-            q += f" AND d.metric_id IN ({','.join('?' * len(metric_ids))})"
-            params.extend(metric_ids)
+            ORDER BY d.timestamp DESC
+            LIMIT ?
+            """,
+            conn,
+            params=[limit],
+        )
 
-        if start_time:
-            q += " AND d.timestamp >= ?"
-            params.append(start_time)
 
-        if end_time:
-            q += " AND d.timestamp <= ?"
-            params.append(end_time)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    # pyarrow's C writer is several times faster than DataFrame.to_csv
+    buf = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
 
-        q += " ORDER BY d.timestamp"
 
-        return pd.read_sql_query(q, conn, params=params)
+@st.cache_data(max_entries=8)
+def raw_csv(db_path: str, version: float, table: str, limit: int) -> bytes:
+    # Encoded once per database version, not on every rerun of the page
+    return to_csv_bytes(load_raw(db_path, version, table, limit))
 
 
 # -----------------------
@@ -102,42 +320,185 @@ def load_data(
 # -----------------------
 
 
-def make_plot(df: pd.DataFrame, show_legend: bool) -> go.Figure | None:
-    if df.empty:
-        return None
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points keeping the shape."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Third vertex is the average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            nxt = slice(end, edges[i + 2])
+            avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        out[i + 1] = prev
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    return out
 
-    fig = go.Figure()
 
-    for (table, source, metric), g in df.groupby(
-        ["table", "source_name", "metric_name"]
-    ):
-        unit = g["unit"].iloc[0]
-        label = f"{table} • {source} • {metric}"
-        if unit:
-            label += f" ({unit})"
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Sorted indices of the min and max of each equal-size bucket (plus the ends)."""
+    size = len(y) // n_buckets
+    blocks = y[: size * n_buckets].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    # The remainder that does not fill a whole bucket keeps its extrema too
+    tail = y[size * n_buckets :]
+    tail_extrema = (
+        size * n_buckets + np.array([tail.argmin(), tail.argmax()]) if len(tail) else []
+    )
+    return np.unique(
+        np.concatenate(
+            (
+                [0, len(y) - 1],
+                offsets + blocks.argmin(axis=1),
+                offsets + blocks.argmax(axis=1),
+                tail_extrema,
+            )
+        ).astype(int)
+    )
+
+
+def downsample(g: pd.DataFrame) -> pd.DataFrame:
+    if len(g) <= DOWNSAMPLE_THRESHOLD:
+        return g
+
+    x = g["timestamp"].to_numpy(dtype="int64").astype(float)
+    y = np.nan_to_num(g["value"].to_numpy(dtype=float))
+
+    # Cheap vectorized extrema pass first, so the LTTB loop sees few points
+    idx = np.arange(len(y))
+    n_buckets = MAX_POINTS_PER_SERIES * MINMAX_RATIO // 2
+    if len(y) > 2 * n_buckets:
+        idx = minmax_indices(y, n_buckets)
+
+    keep = idx[lttb_indices(x[idx], y[idx], MAX_POINTS_PER_SERIES)]
+    # LTTB can still pass over the global extrema, which the plot must show
+    return g.iloc[np.union1d(keep, [y.argmin(), y.argmax()])]
+
+
+def join_with_gaps(arrays: list[np.ndarray], gap: float | None = None) -> np.ndarray:
+    # plotly breaks a line (and a "toself" fill) at a NaN y; the matching x
+    # slot (gap=None) repeats the last value, as NaT serializes as a string
+    parts = []
+    for arr in arrays:
+        parts += [arr, arr[-1:] if gap is None else np.array([gap], dtype=arr.dtype)]
+    return np.concatenate(parts[:-1])
+
 
+def merged_plot(groups: dict[str, pd.DataFrame]) -> go.Figure:
+    # Hundreds of separate GL traces each set up their own draw program;
+    # one trace with gaps between series renders in a single call
+    fig = go.Figure()
+    ts = [g["timestamp"].to_numpy() for g in groups.values()]
+    if "value_min" in next(iter(groups.values())):
         fig.add_trace(
-            go.Scatter(
-                x=g["timestamp"],
-                y=g["value"],
-                mode="lines",
-                name=label,
+            go.Scattergl(
+                x=join_with_gaps([np.concatenate([t, t[::-1]]) for t in ts]),
+                y=join_with_gaps(
+                    [
+                        np.concatenate([g["value_max"], g["value_min"][::-1]])
+                        for g in groups.values()
+                    ],
+                    np.nan,
+                ),
+                fill="toself",
+                opacity=0.2,
+                line=dict(width=0),
+                hoverinfo="skip",
+                showlegend=False,
             )
         )
+    fig.add_trace(
+        go.Scattergl(
+            x=join_with_gaps(ts),
+            y=join_with_gaps([g["value"].to_numpy() for g in groups.values()], np.nan),
+            mode="lines",
+            name="",
+            line=dict(width=1),
+        )
+    )
+    return fig
+
 
-    fig.update_layout(
-        xaxis_title="Time",
-        yaxis_title="Value",
-        hovermode="x unified",
-        height=500,
-        showlegend=show_legend,  # 👈 toggle applied here
-        legend=dict(orientation="h", y=1.02),
-        margin=dict(l=10, r=10, t=40, b=10),
+# Pure in its inputs, so a rerun with unchanged filters reuses the figure
+@st.cache_data(max_entries=32)
+def make_plot(df: pd.DataFrame, show_legend: bool) -> go.Figure | None:
+    if df.empty:
+        return None
+
+    df = df.copy()
+
+    # float32 is plenty for display and halves the binary y arrays sent to
+    # the browser
+    value_cols = df.columns.intersection(["value", "value_min", "value_max"])
+    df[value_cols] = df[value_cols].astype("float32")
+
+    # One label per series so plotly express splits the traces in a single pass;
+    # the strings are built once per distinct series, then broadcast by group id
+    series = df.groupby(
+        ["table", "source_name", "metric_name", "unit"],
+        sort=False,
+        observed=True,
+        dropna=False,
     )
+    keys = series.size().index.to_frame(index=False).astype(object).fillna("")
+    labels = keys["table"] + " • " + keys["source_name"] + " • " + keys["metric_name"]
+    labels = labels.where(keys["unit"] == "", labels + " (" + keys["unit"] + ")")
+    df["label"] = labels.to_numpy()[series.ngroup().to_numpy()]
+
+    # A single series needs no split/concat round-trip
+    if series.ngroups == 1:
+        groups = {labels.iat[0]: downsample(df)}
+        df = groups[labels.iat[0]]
+    else:
+        groups = {
+            label: downsample(g) for label, g in df.groupby("label", sort=False)
+        }
+        df = pd.concat(groups.values(), ignore_index=True)
+
+    if not show_legend and len(groups) > MAX_TRACES:
+        fig = merged_plot(groups)
+    else:
+        # WebGL traces draw each series in one GPU call instead of SVG paths
+        fig = px.line(
+            df, x="timestamp", y="value", color="label", render_mode="webgl"
+        )
+        fig.update_traces(hovertemplate=None)
+
+    # Bucketed data: shade each series' min/max range behind its mean line
+    if "value_min" in df and len(fig.data) == len(groups):
+        for trace in list(fig.data):
+            g = groups[trace.name]
+            fig.add_trace(
+                go.Scattergl(
+                    x=np.concatenate([g["timestamp"], g["timestamp"][::-1]]),
+                    y=np.concatenate([g["value_max"], g["value_min"][::-1]]),
+                    fill="toself",
+                    fillcolor=trace.line.color,
+                    opacity=0.2,
+                    line=dict(width=0),
+                    hoverinfo="skip",
+                    showlegend=False,
+                    legendgroup=trace.legendgroup,
+                )
+            )
+
+    fig.update_layout(PLOT_LAYOUT, showlegend=show_legend)  # 👈 toggle applied here
 
     return fig
 
@@ -167,7 +528,7 @@ def main():
     # Sidebar
     # -----------------------
 
-    db_files = get_db_files()
+    db_files = get_db_files(db_dir_version())
     if not db_files:
         st.error("No .db files found")
         return
@@ -175,8 +536,24 @@ def main():
     selected_db = st.sidebar.selectbox("Database", db_files)
     page = st.sidebar.radio("Page", ["Explore", "Raw data"])
 
-    sources = get_sources(selected_db)
-    metrics = get_metrics(selected_db)
+    version = db_version(selected_db)
+
+    # Databases written before the composite indexes were added only get them
+    # on request: the viewer otherwise never writes to the files it shows
+    if get_missing_indexes(selected_db, version):
+        st.sidebar.warning("This database lacks the query indexes; plots load slower.")
+        if st.sidebar.button("Add indexes"):
+            try:
+                with st.spinner("Adding indexes..."):
+                    DatabaseManager(selected_db).backfill_indexes()
+            except sqlite3.Error as e:
+                # Read-only file, or locked by a running simulation
+                st.sidebar.error(f"Could not add indexes: {e}")
+            else:
+                st.rerun()
+    source_ids_by_name, metric_ids_by_name, metric_units = get_lookups(
+        selected_db, version
+    )
 
     # -----------------------
     # EXPLORE PAGE
@@ -202,29 +579,25 @@ def main():
             with col2:
                 selected_sources = st.multiselect(
                     "Sources",
-                    options=sources["source_name"].tolist(),
+                    options=list(source_ids_by_name),
                     default=st.session_state.filters["sources"],
                 )
                 st.session_state.filters["sources"] = selected_sources
 
             with col3:
-                metric_labels = [
-                    f"{r.metric_name} ({r.unit})" if r.unit else r.metric_name
-                    for r in metrics.itertuples()
-                ]
-                label_to_name = dict(zip(metric_labels, metrics["metric_name"]))
-
-                selected_metric_labels = st.multiselect(
+                # Options are the names themselves; the unit is only display
+                selected_metrics = st.multiselect(
                     "Metrics",
-                    options=metric_labels,
+                    options=list(metric_units),
                     default=[
-                        l
-                        for l in metric_labels
-                        if label_to_name[l] in st.session_state.filters["metrics"]
+                        m
+                        for m in st.session_state.filters["metrics"]
+                        if m in metric_units
                     ],
+                    format_func=lambda m: (
+                        f"{m} ({metric_units[m]})" if metric_units[m] else m
+                    ),
                 )
-
-                selected_metrics = [label_to_name[l] for l in selected_metric_labels]
                 st.session_state.filters["metrics"] = selected_metrics
 
             col4, col5 = st.columns(2)
@@ -248,54 +621,46 @@ def main():
 
             # 👇 Legend toggle
             show_legend = st.toggle("Show legend", value=True)
+            resolution = st.selectbox("Resolution", list(RESOLUTIONS))
 
             if not selected_sources and not selected_metrics:
                 st.info("Select a source or a metric to begin")
                 return
 
-            source_ids = (
-                sources.loc[
-                    sources["source_name"].isin(selected_sources), "source_id"
-                ].tolist()
-                if selected_sources
-                else None
-            )
-
-            metric_ids = (
-                metrics.loc[
-                    metrics["metric_name"].isin(selected_metrics), "metric_id"
-                ].tolist()
-                if selected_metrics
-                else None
-            )
+            source_ids = [source_ids_by_name[n] for n in selected_sources] or None
+            metric_ids = [metric_ids_by_name[n] for n in selected_metrics] or None
 
+            # Half-open [start day, day after end day) in the stored timestamp
+            # format, so the filter is a plain string range on the index
             start_time = (
-                datetime.combine(start_date, datetime.min.time()).isoformat()
+                datetime.combine(start_date, datetime.min.time()).strftime(
+                    TIMESTAMP_FORMAT
+                )
                 if start_date
                 else None
             )
             end_time = (
-                datetime.combine(end_date, datetime.max.time()).isoformat()
+                datetime.combine(
+                    end_date + timedelta(days=1), datetime.min.time()
+                ).strftime(TIMESTAMP_FORMAT)
                 if end_date
                 else None
             )
 
-            dfs: list[pd.DataFrame] = []
-
-            for table in selected_tables:
-                df = load_data(
+            df = (
+                load_data(
                     selected_db,
-                    table,
+                    version,
+                    tuple(selected_tables),
                     source_ids,
                     metric_ids,
                     start_time,
                     end_time,
+                    RESOLUTIONS[resolution],
                 )
-                if not df.empty:
-                    df["table"] = table
-                    dfs.append(df)
-
-            df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+                if selected_tables
+                else pd.DataFrame()
+            )
 
             fig = make_plot(df, show_legend)
 
@@ -321,32 +686,17 @@ def main():
             table = st.selectbox("Table", DATA_TABLES, format_func=str.capitalize)
             limit = st.slider("Rows", 100, 5000, 1000, step=100)
 
-        with connect(selected_db) as conn:
-            df = pd.read_sql_query(
-                f"""
-                SELECT
-                    d.timestamp,
-                    s.source_name,
-                    m.metric_name,
-                    m.unit,
-                    d.value
-                FROM {table} d
-                JOIN source s ON d.source_id = s.source_id
-                JOIN metric m ON d.metric_id = m.metric_id
-                ORDER BY d.timestamp DESC
-                LIMIT ?
-                """,
-                conn,
-                params=[limit],
-            )
+        df = load_raw(selected_db, version, table, limit)
 
         st.dataframe(df, use_container_width=True, hide_index=True)
 
+        # Clicking only downloads; no rerun that would rebuild the page
         st.download_button(
             "Download CSV",
-            df.to_csv(index=False),
+            raw_csv(selected_db, version, table, limit),
             file_name=f"{table}_raw.csv",
             mime="text/csv",
+            on_click="ignore",
         )
 
 
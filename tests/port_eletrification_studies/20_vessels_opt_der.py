@@ -1,5 +1,7 @@
 """Main entry point for the electric port simulator."""
 
+import string
+
 from models import Port, Boat, Charger, PV, BESS, BESSControlStrategy
 from config import Settings, SimulationMode
 from database import DatabaseManager
@@ -29,267 +31,26 @@ def main():
     # Boat configuration
     #  Add/remove boats, modify boat parameters (motor_power, weight, length,
     #       battery_capacity, range_speed, soc) as needed
-    boat1 = Boat(
-        name="SeaBreeze_1",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.30,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat2 = Boat(
-        name="SeaBreeze_2",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat3 = Boat(
-        name="SeaBreeze_3",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat4 = Boat(
-        name="SeaBreeze_4",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat5 = Boat(
-        # Charger configuration
-        name="SeaBreeze_5",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat6 = Boat(
-        name="SeaBreeze_6",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat7 = Boat(
-        name="SeaBreeze_7",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat8 = Boat(
-        name="SeaBreeze_8",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat9 = Boat(
-        name="SeaBreeze_9",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat10 = Boat(
-        name="SeaBreeze_10",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat11 = Boat(
-        name="SeaBreeze_11",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat12 = Boat(
-        name="SeaBreeze_12",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat13 = Boat(
-        name="SeaBreeze_13",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat14 = Boat(
-        name="SeaBreeze_14",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat15 = Boat(
-        name="SeaBreeze_15",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat16 = Boat(
-        name="SeaBreeze_16",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat17 = Boat(
-        name="SeaBreeze_17",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat18 = Boat(
-        name="SeaBreeze_18",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat19 = Boat(
-        name="SeaBreeze_19",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    boat20 = Boat(
-        name="SeaBreeze_20",
-        motor_power=100,  #  Adjust motor power (kW)
-        weight=2500,  #  Adjust weight (kg)
-        length=8.5,  #  Adjust length (m)
-        battery_capacity=100,  #  Adjust battery capacity (kWh)
-        range_speed=16.0,  #  Adjust range speed (knots)
-        soc=0.50,  #  Adjust initial state of charge (0.0-1.0)
-    )
-
-    charger1 = Charger(
-        name="FastCharger_A", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger2 = Charger(
-        name="FastCharger_B", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger3 = Charger(
-        name="FastCharger_C", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger4 = Charger(
-        name="FastCharger_D", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger5 = Charger(
-        name="FastCharger_E", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger6 = Charger(
-        name="FastCharger_F", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger7 = Charger(
-        name="FastCharger_G", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger8 = Charger(
-        name="FastCharger_H", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger9 = Charger(
-        name="FastCharger_I", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger10 = Charger(
-        name="FastCharger_J", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger11 = Charger(
-        name="FastCharger_K", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger12 = Charger(
-        name="FastCharger_L", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger13 = Charger(
-        name="FastCharger_M", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger14 = Charger(
-        name="FastCharger_N", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger15 = Charger(
-        name="FastCharger_O", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger16 = Charger(
-        name="FastCharger_P", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger17 = Charger(
-        name="FastCharger_Q", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger18 = Charger(
-        name="FastCharger_R", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger19 = Charger(
-        name="FastCharger_S", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
-    charger20 = Charger(
-        name="FastCharger_T", max_power=22, efficiency=0.95
-    )  #  Adjust max_power (kW) and efficiency
+    boats = [
+        Boat(
+            name=f"SeaBreeze_{i}",
+            motor_power=100,  #  Adjust motor power (kW)
+            weight=2500,  #  Adjust weight (kg)
+            length=8.5,  #  Adjust length (m)
+            battery_capacity=100,  #  Adjust battery capacity (kWh)
+            range_speed=16.0,  #  Adjust range speed (knots)
+            soc=0.30 if i == 1 else 0.50,  #  Adjust initial state of charge (0.0-1.0)
+        )
+        for i in range(1, 21)
+    ]
+
+    # Charger configuration: FastCharger_A .. FastCharger_T
+    chargers = [
+        Charger(
+            name=f"FastCharger_{letter}", max_power=22, efficiency=0.95
+        )  #  Adjust max_power (kW) and efficiency
+        for letter in string.ascii_uppercase[:20]
+    ]
 
     # PV system configuration
     #  Modify PV capacity, tilt, azimuth, efficiency, or remove PV system entirely
@@ -317,57 +78,18 @@ def main():
     )
 
     # Add components to port
-    port.add_boat(boat1)
-    port.add_boat(boat2)
-    port.add_boat(boat3)
-    port.add_boat(boat4)
-    port.add_boat(boat5)
-    port.add_boat(boat6)
-    port.add_boat(boat7)
-    port.add_boat(boat8)
-    port.add_boat(boat9)
-    port.add_boat(boat10)
-    port.add_boat(boat11)
-    port.add_boat(boat12)
-    port.add_boat(boat13)
-    port.add_boat(boat14)
-    port.add_boat(boat15)
-    port.add_boat(boat16)
-    port.add_boat(boat17)
-    port.add_boat(boat18)
-    port.add_boat(boat19)
-    port.add_boat(boat20)
-    port.add_charger(charger11)
-    port.add_charger(charger12)
-    port.add_charger(charger13)
-    port.add_charger(charger14)
-    port.add_charger(charger15)
-    port.add_charger(charger16)
-    port.add_charger(charger17)
-    port.add_charger(charger18)
-    port.add_charger(charger19)
-    port.add_charger(charger20)
-    port.add_charger(charger1)
-    port.add_charger(charger2)
-    port.add_charger(charger3)
-    port.add_charger(charger4)
-    port.add_charger(charger5)
-    port.add_charger(charger6)
-    port.add_charger(charger7)
-    port.add_charger(charger8)
-    port.add_charger(charger9)
-    port.add_charger(charger10)
+    for boat in boats:
+        port.add_boat(boat)
+    # Chargers K..T are registered ahead of A..J
+    for charger in chargers[10:] + chargers[:10]:
+        port.add_charger(charger)
 
     port.add_pv(pv_system)
     port.add_bess(bess)
 
     print(f"\nPort: {port}")
-    print(
-        f"Boats: {boat1.name}, {boat2.name}, {boat3.name}, {boat4.name}, {boat5.name} {boat6.name}, {boat7.name}, {boat8.name}, {boat9.name}, {boat10.name}, {boat11.name}, {boat12.name}, {boat13.name}, {boat14.name}, {boat15.name}, {boat16.name}, {boat17.name}, {boat18.name}, {boat19.name}, {boat20.name}"
-    )
-    print(
-        f"Chargers: {charger1.name}, {charger2.name}, {charger3.name}, {charger4.name}, {charger5.name}, {charger6.name}, {charger7.name}, {charger8.name}, {charger9.name}, {charger10.name}, {charger11.name}, {charger12.name}, {charger13.name}, {charger14.name}, {charger15.name}, {charger16.name}, {charger17.name}, {charger18.name}, {charger19.name}, {charger20.name}"
-    )
+    print(f"Boats: {', '.join(boat.name for boat in boats)}")
+    print(f"Chargers: {', '.join(charger.name for charger in chargers)}")
     # print(f"PV: {pv_system}")
     # print(f"BESS: {bess}")
 
@@ -137,12 +137,8 @@ def main():
     # port.add_bess(bess)
 
     print(f"\nPort: {port}")
-    print(
-        f"Boats: {boat1.name}, {boat2.name}, {boat3.name}, {boat4.name}, {boat5.name}"
-    )
-    print(
-        f"Chargers: {charger1.name}, {charger2.name}, {charger3.name}, {charger4.name}, {charger5.name}"
-    )
+    print(f"Boats: {', '.join(boat.name for boat in port.boats)}")
+    print(f"Chargers: {', '.join(charger.name for charger in port.chargers)}")
     # print(f"PV: {pv_system}")
     # print(f"BESS: {bess}")
 
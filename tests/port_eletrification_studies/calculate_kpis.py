@@ -9,9 +9,12 @@ KPI 5 – Self-Sufficiency Rate (% of demand from PV)
 KPI 6 – Trip Reliability (% of trips completed)
 """
 
+import pickle
 import sqlite3
+import numpy as np
 import pandas as pd
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tabulate import tabulate
 
@@ -35,6 +38,9 @@ SCENARIOS = [
 
 VESSEL_COUNTS = [5, 10, 20]
 
+# Results of previous runs, reused while the database and this script are unchanged
+CACHE_PATH = Path(__file__).parent / "comparison_results" / ".kpi_cache.pkl"
+
 
 def get_db_path(vessels: int, scenario: str) -> str:
     """Get database path for a scenario."""
@@ -42,92 +48,73 @@ def get_db_path(vessels: int, scenario: str) -> str:
     return str(project_root / f"{vessels}_vessels_{scenario}.db")
 
 
-def get_electricity_cost(timestamp_str: str) -> float:
-    """Get electricity cost based on time of day."""
-    hour = int(timestamp_str.split(" ")[1].split(":")[0])
-    if 8 <= hour < 20:
-        return TARIFF_PEAK
-    return TARIFF_OFF_PEAK
+def open_ro(db_path: str) -> sqlite3.Connection:
+    """Open a scenario database read-only, tuned for large sequential scans."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.execute("PRAGMA query_only = 1")
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+    conn.execute("PRAGMA cache_size = -200000")  # ~200 MB
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
 
 
-def analyze_trip_reliability(db_path: str, num_vessels: int) -> dict:
+def load_metadata(conn: sqlite3.Connection) -> dict:
+    """Look up metric ids and port/boat sources once per database."""
+    metrics = pd.read_sql_query("SELECT metric_id, metric_name FROM metric", conn)
+    sources = pd.read_sql_query("SELECT source_id, source_type FROM source", conn)
+    return {
+        'metric_map': dict(zip(metrics['metric_name'], metrics['metric_id'])),
+        'port_ids': sources.loc[sources['source_type'] == 'port', 'source_id'].tolist(),
+        'boat_ids': sources.loc[sources['source_type'] == 'boat', 'source_id'].tolist(),
+    }
+
+
+def analyze_trip_reliability(conn: sqlite3.Connection, meta: dict, num_vessels: int) -> dict:
     """Analyze trip reliability from boat state data."""
     total_trips = num_vessels * 2  # 2 trips per vessel per day
     
-    if not os.path.exists(db_path):
-        return {'on_time': 0, 'delayed': 0, 'cancelled': total_trips, 'total': total_trips}
-    
-    conn = sqlite3.connect(db_path)
-    
-    # Get state metric
-    state_result = pd.read_sql_query(
-        "SELECT metric_id FROM metric WHERE metric_name = 'state'", conn
-    )
-    if state_result.empty:
-        conn.close()
+    state_id = meta['metric_map'].get('state')
+    if state_id is None:
         return {'on_time': 0, 'delayed': 0, 'cancelled': total_trips, 'total': total_trips}
     
-    state_id = state_result.iloc[0, 0]
-    
-    # Get boat sources
-    boats = pd.read_sql_query(
-        "SELECT source_id, source_name FROM source WHERE source_type = 'boat'", conn
-    )
-    
-    on_time = 0
-    delayed = 0
-    cancelled = 0
-    
-    for _, boat in boats.iterrows():
-        query = f"""
-            SELECT timestamp, CAST(value AS FLOAT) as state
-            FROM measurements
-            WHERE source_id = {boat['source_id']} AND metric_id = {state_id}
-            ORDER BY timestamp
+    # State history of every boat in one query, read straight into arrays
+    rows = conn.execute(
         """
-        states = pd.read_sql_query(query, conn)
-        
-        if states.empty:
-            cancelled += 2
-            continue
-        
-        states['timestamp'] = pd.to_datetime(states['timestamp'])
-        
-        # Find trip starts (state changes to 1.0 = sailing)
-        trip_starts = []
-        prev_state = 0
-        for _, row in states.iterrows():
-            if row['state'] == 1.0 and prev_state == 0.0:
-                trip_starts.append(row['timestamp'])
-            prev_state = row['state']
-        
-        # Analyze each trip slot
-        morning_found = False
-        afternoon_found = False
-        
-        for ts in trip_starts:
-            hour = ts.hour
-            minute = ts.minute
-            
-            if 9 <= hour < 12:
-                if hour == 9 and minute < 15:
-                    on_time += 1
-                else:
-                    delayed += 1
-                morning_found = True
-            elif 14 <= hour < 18:
-                if hour == 14 and minute < 15:
-                    on_time += 1
-                else:
-                    delayed += 1
-                afternoon_found = True
-        
-        if not morning_found:
-            cancelled += 1
-        if not afternoon_found:
-            cancelled += 1
-    
-    conn.close()
+            SELECT source_id, timestamp, CAST(value AS FLOAT)
+            FROM measurements
+            WHERE metric_id = ?
+              AND source_id IN (SELECT source_id FROM source WHERE source_type = 'boat')
+            ORDER BY source_id, timestamp
+        """,
+        [int(state_id)],
+    ).fetchall()
+    source_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    # State is stored as 1.0 while sailing and 0.0 otherwise
+    sailing = np.fromiter((r[2] == 1.0 for r in rows), dtype=np.bool_, count=len(rows))
+    
+    # Find trip starts (state changes to 1.0 = sailing), per boat
+    was_sailing = np.zeros_like(sailing)
+    was_sailing[1:] = sailing[:-1]
+    was_sailing[1:][source_ids[1:] != source_ids[:-1]] = False
+    starts = np.flatnonzero(sailing & ~was_sailing)
+    start_ids = source_ids[starts]
+    # Timestamps are 'YYYY-MM-DD HH:MM:SS' strings
+    hour = np.array([int(rows[i][1][11:13]) for i in starts], dtype=np.int64)
+    minute = np.array([int(rows[i][1][14:16]) for i in starts], dtype=np.int64)
+    
+    # Classify each start by trip slot; within 15 min of 9:00/14:00 is on time
+    morning = (hour >= 9) & (hour < 12)
+    afternoon = (hour >= 14) & (hour < 18)
+    punctual = ((hour == 9) | (hour == 14)) & (minute < 15)
+    on_time = int(((morning | afternoon) & punctual).sum())
+    delayed = int(((morning | afternoon) & ~punctual).sum())
+    
+    # Every boat slot without a start counts as cancelled
+    cancelled = (
+        2 * len(meta['boat_ids'])
+        - len(np.unique(start_ids[morning]))
+        - len(np.unique(start_ids[afternoon]))
+    )
     
     return {
         'on_time': on_time,
@@ -138,25 +125,12 @@ def analyze_trip_reliability(db_path: str, num_vessels: int) -> dict:
     }
 
 
-def calculate_kpis(db_path: str, has_der: bool = False) -> dict:
+def calculate_kpis(conn: sqlite3.Connection, meta: dict, has_der: bool = False) -> dict:
     """Calculate all KPIs for a scenario."""
-    if not os.path.exists(db_path):
+    if not meta['port_ids']:
         return None
-    
-    conn = sqlite3.connect(db_path)
-    
-    # Get port source
-    port_source = pd.read_sql_query(
-        "SELECT source_id FROM source WHERE source_type = 'port'", conn
-    )
-    if port_source.empty:
-        conn.close()
-        return None
-    port_id = port_source.iloc[0, 0]
-    
-    # Get metrics
-    metrics = pd.read_sql_query("SELECT metric_id, metric_name FROM metric", conn)
-    metric_map = dict(zip(metrics['metric_name'], metrics['metric_id']))
+    port_id = meta['port_ids'][0]
+    metric_map = meta['metric_map']
     
     timestep_hours = 0.25  # 15 minutes
     
@@ -164,49 +138,45 @@ def calculate_kpis(db_path: str, has_der: bool = False) -> dict:
     # Get consumption and import data
     # =========================================================================
     
-    consumption_query = f"""
-        SELECT timestamp, CAST(value AS FLOAT) as power_kw
-        FROM measurements
-        WHERE source_id = {port_id} 
-        AND metric_id = {metric_map.get('power_active_consumption', -1)}
-        ORDER BY timestamp
-    """
-    consumption_df = pd.read_sql_query(consumption_query, conn)
-    
-    if consumption_df.empty:
-        conn.close()
+    # Per-metric count, sum, peak and tariff-weighted sum of the port's power,
+    # aggregated in SQLite; peak tariff applies from 8:00 to 20:00
+    wanted = [
+        metric_map.get(name, -1)
+        for name in ('power_active_consumption', 'power_active_import', 'power_active_production')
+    ]
+    rows = conn.execute(
+        """
+            SELECT metric_id,
+                   COUNT(*),
+                   SUM(CAST(value AS REAL)),
+                   MAX(CAST(value AS REAL)),
+                   SUM(CAST(value AS REAL) * CASE
+                       WHEN CAST(substr(timestamp, 12, 2) AS INTEGER) BETWEEN 8 AND 19
+                       THEN ? ELSE ? END)
+            FROM measurements
+            WHERE source_id = ?
+              AND metric_id IN (?, ?, ?)
+            GROUP BY metric_id
+        """,
+        [TARIFF_PEAK, TARIFF_OFF_PEAK, int(port_id)] + [int(m) for m in wanted],
+    ).fetchall()
+    by_metric = {row[0]: row[1:] for row in rows}
+    consumption, grid_import, pv = (by_metric.get(m, (0, 0.0, None, 0.0)) for m in wanted)
+    
+    if consumption[0] == 0:
         return None
     
-    consumption_df['energy_kwh'] = consumption_df['power_kw'] * timestep_hours
-    total_consumption_kwh = consumption_df['energy_kwh'].sum()
-    peak_consumption = consumption_df['power_kw'].max()
-    
-    # Grid import
-    import_query = f"""
-        SELECT timestamp, CAST(value AS FLOAT) as power_kw
-        FROM measurements
-        WHERE source_id = {port_id} 
-        AND metric_id = {metric_map.get('power_active_import', -1)}
-        ORDER BY timestamp
-    """
-    import_df = pd.read_sql_query(import_query, conn)
-    
-    if not import_df.empty:
-        import_df['energy_kwh'] = import_df['power_kw'] * timestep_hours
-        import_df['cost_eur'] = import_df.apply(
-            lambda row: row['energy_kwh'] * get_electricity_cost(row['timestamp']),
-            axis=1
-        )
-        total_grid_import_kwh = import_df['energy_kwh'].sum()
-        total_cost_eur = import_df['cost_eur'].sum()
-        peak_import = import_df['power_kw'].max()
+    total_consumption_kwh = consumption[1] * timestep_hours
+    peak_consumption = consumption[2]
+    
+    # Grid import; without import data all consumption is bought from the grid
+    if grid_import[0] > 0:
+        total_grid_import_kwh = grid_import[1] * timestep_hours
+        total_cost_eur = grid_import[3] * timestep_hours
+        peak_import = grid_import[2]
     else:
         total_grid_import_kwh = total_consumption_kwh
-        consumption_df['cost_eur'] = consumption_df.apply(
-            lambda row: row['energy_kwh'] * get_electricity_cost(row['timestamp']),
-            axis=1
-        )
-        total_cost_eur = consumption_df['cost_eur'].sum()
+        total_cost_eur = consumption[3] * timestep_hours
         peak_import = peak_consumption
     
     # =========================================================================
@@ -219,19 +189,9 @@ def calculate_kpis(db_path: str, has_der: bool = False) -> dict:
     self_sufficiency_rate = 0
     
     if has_der:
-        # Get PV production from port metrics
-        pv_query = f"""
-            SELECT timestamp, CAST(value AS FLOAT) as power_kw
-            FROM measurements
-            WHERE source_id = {port_id} 
-            AND metric_id = {metric_map.get('power_active_production', -1)}
-            ORDER BY timestamp
-        """
-        pv_df = pd.read_sql_query(pv_query, conn)
-        
-        if not pv_df.empty:
-            pv_df['energy_kwh'] = pv_df['power_kw'] * timestep_hours
-            pv_generated_kwh = pv_df['energy_kwh'].sum()
+        # PV production was aggregated with the other port metrics above
+        if pv[0] > 0:
+            pv_generated_kwh = pv[1] * timestep_hours
         
         # Self-consumption = consumption - grid import (what came from PV)
         pv_consumed_kwh = max(0, total_consumption_kwh - total_grid_import_kwh)
@@ -242,8 +202,6 @@ def calculate_kpis(db_path: str, has_der: bool = False) -> dict:
         if total_consumption_kwh > 0:
             self_sufficiency_rate = (pv_consumed_kwh / total_consumption_kwh) * 100
     
-    conn.close()
-    
     return {
         'total_consumption_kwh': total_consumption_kwh,
         'total_grid_import_kwh': total_grid_import_kwh,
@@ -257,19 +215,73 @@ def calculate_kpis(db_path: str, has_der: bool = False) -> dict:
     }
 
 
+def analyze_db(db_path: str, vessels: int, has_der: bool) -> tuple:
+    """Return (kpis, reliability) for one scenario database."""
+    # One connection and one metadata lookup shared by both analyses
+    conn = open_ro(db_path)
+    try:
+        meta = load_metadata(conn)
+        kpis = calculate_kpis(conn, meta, has_der)
+        reliability = analyze_trip_reliability(conn, meta, vessels)
+    finally:
+        conn.close()
+    return kpis, reliability
+
+
+def load_cache() -> dict:
+    """Load cached analysis results, or an empty cache if none are usable."""
+    try:
+        with open(CACHE_PATH, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+
+
+def save_cache(cache: dict):
+    """Persist analysis results for the next run."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, 'wb') as f:
+        pickle.dump(cache, f)
+
+
 def main():
     print("=" * 100)
     print("PORT ELECTRIFICATION STUDY - KPI ANALYSIS")
     print("=" * 100)
     
     results = []
+    cache = load_cache()
+    script_mtime = os.path.getmtime(__file__)
+    
+    # Find databases that are missing from the cache or changed since
+    pending = {}
+    for vessels in VESSEL_COUNTS:
+        for scenario_key, _, has_der in SCENARIOS:
+            db_path = get_db_path(vessels, scenario_key)
+            if not os.path.exists(db_path):
+                continue
+            key = (db_path, vessels, has_der)
+            stamp = (os.path.getmtime(db_path), script_mtime)
+            cached = cache.get(key)
+            if cached is None or cached[0] != stamp:
+                pending[key] = stamp
+    
+    # Each database is analyzed independently, so spread them over processes
+    if pending:
+        jobs = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {key: pool.submit(analyze_db, *key) for key in pending}
+        for key, future in futures.items():
+            cache[key] = (pending[key], future.result())
+        save_cache(cache)
     
     for vessels in VESSEL_COUNTS:
         for scenario_key, scenario_name, has_der in SCENARIOS:
             db_path = get_db_path(vessels, scenario_key)
             
-            kpis = calculate_kpis(db_path, has_der)
-            reliability = analyze_trip_reliability(db_path, vessels)
+            kpis = None
+            if os.path.exists(db_path):
+                kpis, reliability = cache[(db_path, vessels, has_der)][1]
             
             if kpis is None:
                 print(f"Warning: Could not load {vessels} vessels, {scenario_name}")
@@ -296,6 +308,7 @@ def main():
             })
     
     df = pd.DataFrame(results)
+    df['Scenario'] = pd.Categorical(df['Scenario'], categories=[name for _, name, _ in SCENARIOS])
     
     # =========================================================================
     # TABLE 1: RELIABILITY METRICS
@@ -321,7 +334,7 @@ def main():
     print("\n" + "=" * 100)
     print("TABLE 3: RENEWABLE ENERGY UTILIZATION (DER Scenarios)")
     print("=" * 100)
-    der_df = df[df['Scenario'].str.contains('DER') & ~df['Scenario'].str.contains('No DER')]
+    der_df = df[df['Scenario'].isin([name for _, name, has_der in SCENARIOS if has_der])]
     cols3 = ['Vessels', 'Scenario', 'PV (kWh)', 'KPI 4: Self-Cons (%)', 'KPI 5: Self-Suff (%)']
     print(tabulate(der_df[cols3], headers='keys', tablefmt='grid', showindex=False))
     
@@ -350,10 +363,10 @@ def main():
 \hline
 """
     
-    for _, row in df.iterrows():
-        sc = row['KPI 4: Self-Cons (%)'] if row['KPI 4: Self-Cons (%)'] != '-' else '-'
-        ss = row['KPI 5: Self-Suff (%)'] if row['KPI 5: Self-Suff (%)'] != '-' else '-'
-        latex += f"{row['Vessels']} & {row['Scenario']} & {row['KPI 6: Reliability (%)']} & {row['KPI 1: Cost (€)']} & {row['KPI 2: €/Trip']} & {row['KPI 3: Peak (kW)']} & {sc} & {ss} \\\\\n"
+    latex_cols = ['Vessels', 'Scenario', 'KPI 6: Reliability (%)', 'KPI 1: Cost (€)',
+                  'KPI 2: €/Trip', 'KPI 3: Peak (kW)', 'KPI 4: Self-Cons (%)', 'KPI 5: Self-Suff (%)']
+    rows = df[latex_cols].astype(str).agg(' & '.join, axis=1)
+    latex += ''.join(row + " \\\\\n" for row in rows)
     
     latex += r"""\hline
 \end{tabular}
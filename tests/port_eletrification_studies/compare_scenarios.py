@@ -63,13 +63,15 @@ def load_boat_soc_data(db_path: str) -> pd.DataFrame:
     # Get SOC measurements for all boats
     all_data = []
     for _, row in boat_sources.iterrows():
-        query = f"""
-            SELECT timestamp, CAST(value AS FLOAT) as soc, '{row['source_name']}' as boat
+        query = """
+            SELECT timestamp, CAST(value AS FLOAT) as soc, ? as boat
             FROM measurements
-            WHERE source_id = {row['source_id']} AND metric_id = {soc_id}
+            WHERE source_id = ? AND metric_id = ?
             ORDER BY timestamp
         """
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(
+            query, conn, params=[row['source_name'], int(row['source_id']), int(soc_id)]
+        )
         all_data.append(df)
     
     conn.close()
@@ -107,18 +109,22 @@ def load_power_data(db_path: str) -> pd.DataFrame:
     ).iloc[0, 0]
     
     # Get power measurements
-    query = f"""
+    query = """
         SELECT 
             m1.timestamp,
             CAST(m1.value AS FLOAT) as consumption,
             CAST(m2.value AS FLOAT) as contracted_power
         FROM measurements m1
-        JOIN measurements m2 ON m1.timestamp = m2.timestamp AND m2.source_id = {port_source} AND m2.metric_id = {contracted_id}
-        WHERE m1.source_id = {port_source} AND m1.metric_id = {consumption_id}
+        JOIN measurements m2 ON m1.timestamp = m2.timestamp AND m2.source_id = ? AND m2.metric_id = ?
+        WHERE m1.source_id = ? AND m1.metric_id = ?
         ORDER BY m1.timestamp
     """
     
-    df = pd.read_sql_query(query, conn)
+    df = pd.read_sql_query(
+        query,
+        conn,
+        params=[int(port_source), int(contracted_id), int(port_source), int(consumption_id)],
+    )
     conn.close()
     
     if not df.empty:
@@ -149,13 +155,15 @@ def load_charger_power_data(db_path: str) -> pd.DataFrame:
     # Get power measurements for all chargers
     all_data = []
     for _, row in charger_sources.iterrows():
-        query = f"""
-            SELECT timestamp, CAST(value AS FLOAT) as power, '{row['source_name']}' as charger
+        query = """
+            SELECT timestamp, CAST(value AS FLOAT) as power, ? as charger
             FROM measurements
-            WHERE source_id = {row['source_id']} AND metric_id = {power_id}
+            WHERE source_id = ? AND metric_id = ?
             ORDER BY timestamp
         """
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(
+            query, conn, params=[row['source_name'], int(row['source_id']), int(power_id)]
+        )
         all_data.append(df)
     
     conn.close()
@@ -191,13 +199,15 @@ def load_boat_state_data(db_path: str) -> pd.DataFrame:
     # Get state measurements for all boats
     all_data = []
     for _, row in boat_sources.iterrows():
-        query = f"""
-            SELECT timestamp, CAST(value AS FLOAT) as state, '{row['source_name']}' as boat
+        query = """
+            SELECT timestamp, CAST(value AS FLOAT) as state, ? as boat
             FROM measurements
-            WHERE source_id = {row['source_id']} AND metric_id = {state_id}
+            WHERE source_id = ? AND metric_id = ?
             ORDER BY timestamp
         """
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(
+            query, conn, params=[row['source_name'], int(row['source_id']), int(state_id)]
+        )
         all_data.append(df)
     
     conn.close()
@@ -250,33 +260,29 @@ def analyze_reliability(db_path: str, num_vessels: int) -> dict:
             "cancel_rate": 100.0,
         }
     
-    # Get unique boats
-    boats = state_data['boat'].unique()
-    
     on_time_trips = 0
     delayed_trips = 0
     cancelled_trips = 0
     
-    for boat in boats:
-        boat_data = state_data[state_data['boat'] == boat].sort_values('timestamp')
+    # Hour and minute of every sample, from integer minutes since the epoch
+    state_data = state_data.sort_values('timestamp')
+    epoch_minutes = state_data['timestamp'].to_numpy(dtype='datetime64[m]').astype(np.int64)
+    state_data = state_data.assign(hour=(epoch_minutes // 60) % 24, minute=epoch_minutes % 60)
+    
+    # One groupby pass instead of a boolean mask over all rows per boat
+    for boat, boat_data in state_data.groupby('boat', sort=False):
         
         # Find all trip starts (when state changes from 0 to 1)
-        state_values = boat_data['state'].values
-        timestamps = boat_data['timestamp'].values
-        
-        trip_starts = []
-        for i in range(1, len(state_values)):
-            if state_values[i] == 1.0 and state_values[i-1] == 0.0:
-                trip_starts.append(pd.to_datetime(timestamps[i]))
+        sailing = boat_data['state'].to_numpy() == 1.0
+        starts = np.flatnonzero(sailing[1:] & ~sailing[:-1]) + 1
+        start_hours = boat_data['hour'].to_numpy()[starts].tolist()
+        start_minutes = boat_data['minute'].to_numpy()[starts].tolist()
         
         # Analyze each trip slot
         morning_trip_found = False
         afternoon_trip_found = False
         
-        for trip_start in trip_starts:
-            hour = trip_start.hour
-            minute = trip_start.minute
-            
+        for hour, minute in zip(start_hours, start_minutes):
             if hour == 9 and minute < 15:
                 # Morning trip started on time
                 on_time_trips += 1
@@ -339,11 +345,10 @@ def plot_soc_comparison(vessels: int, output_dir: str):
             continue
         
         # Plot SOC for each boat
-        boats = sorted(soc_data['boat'].unique())
-        colors_boats = plt.cm.tab20(np.linspace(0, 1, len(boats)))
+        boat_groups = soc_data.sort_values('timestamp').groupby('boat')
+        colors_boats = plt.cm.tab20(np.linspace(0, 1, boat_groups.ngroups))
         
-        for i, boat in enumerate(boats):
-            boat_data = soc_data[soc_data['boat'] == boat].sort_values('timestamp')
+        for i, (boat, boat_data) in enumerate(boat_groups):
             ax.plot(boat_data['timestamp'], boat_data['soc'], 
                    color=colors_boats[i], alpha=0.7, linewidth=1.5, label=boat)
         
@@ -656,13 +661,15 @@ def load_charger_power_data(db_path: str) -> pd.DataFrame:
     
     all_data = []
     for _, row in charger_sources.iterrows():
-        query = f"""
-            SELECT timestamp, CAST(value AS FLOAT) as power, '{row['source_name']}' as charger
+        query = """
+            SELECT timestamp, CAST(value AS FLOAT) as power, ? as charger
             FROM measurements
-            WHERE source_id = {row['source_id']} AND metric_id = {power_id}
+            WHERE source_id = ? AND metric_id = ?
             ORDER BY timestamp
         """
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(
+            query, conn, params=[row['source_name'], int(row['source_id']), int(power_id)]
+        )
         all_data.append(df)
     
     conn.close()
@@ -716,10 +723,9 @@ def plot_soc_grid(output_dir: str):
             soc_data = load_boat_soc_data(db_path)
             
             if not soc_data.empty:
-                boats = sorted(soc_data['boat'].unique())
+                boat_groups = soc_data.sort_values('timestamp').groupby('boat')
                 
-                for b_idx, boat in enumerate(boats):
-                    boat_data = soc_data[soc_data['boat'] == boat].sort_values('timestamp')
+                for b_idx, (boat, boat_data) in enumerate(boat_groups):
                     hours = np.array([(t.hour + t.minute/60.0) for t in boat_data['timestamp']])
                     # SOC is already stored as percentage (0-100) in database
                     soc_values = boat_data['soc'].values
@@ -816,10 +822,12 @@ def plot_power_grid(output_dir: str):
                 if not charger_data.empty:
                     chargers = charger_data['charger'].unique()
                     
-                    # Create pivot table for stacked area
-                    pivot = charger_data.pivot_table(
-                        index='timestamp', columns='charger', values='power', 
-                        aggfunc='first'
+                    # Create pivot table for stacked area (keep first sample per
+                    # timestamp/charger so the vectorized pivot sees unique keys)
+                    pivot = charger_data.drop_duplicates(
+                        subset=['timestamp', 'charger'], keep='first'
+                    ).pivot(
+                        index='timestamp', columns='charger', values='power'
                     ).fillna(0)
                     
                     if len(pivot) > 0:
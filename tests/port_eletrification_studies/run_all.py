@@ -1,5 +1,7 @@
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 THIS_DIR = Path(__file__).parent
@@ -24,20 +26,35 @@ if not scripts:
     print("No test scripts found.")
     sys.exit(1)
 
-failed = []
 
-for script in scripts:
+def run(script: Path) -> subprocess.CompletedProcess:
     module = f"tests.port_eletrification_studies.{script.stem}"
-    print(f"\n▶ Running {module}")
-
-    result = subprocess.run(
+    print(f"▶ Running {module}")
+    # Output is captured so parallel runs don't interleave on the console
+    return subprocess.run(
         [sys.executable, "-m", module],
-        stdout=sys.stdout,
-        stderr=sys.stderr,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
     )
 
-    if result.returncode != 0:
-        failed.append(script.name)
+
+failed = []
+
+# Scenarios are independent processes writing their own .db files, so they
+# can run side by side; threads here only wait on the child processes
+jobs = min(len(scripts), os.cpu_count() or 1)
+with ThreadPoolExecutor(max_workers=jobs) as pool:
+    futures = {pool.submit(run, script): script for script in scripts}
+    for future in as_completed(futures):
+        script = futures[future]
+        result = future.result()
+
+        print(f"\n■ {script.name}")
+        print(result.stdout, end="")
+
+        if result.returncode != 0:
+            failed.append(script.name)
 
 print("\n" + "=" * 50)
 if failed:
@@ -0,0 +1,166 @@
+"""
+Test: Database Manager Connections
+
+Objective:
+    Confirm get_connection commits and rolls back as documented, both with
+    a connection per block and with a persistent connection, and that index
+    backfilling only writes where indexes are missing.
+
+Test Case:
+    Records are saved from nested get_connection blocks, some of which
+    fail. Indexes are backfilled on foreign, older and current databases.
+
+Expected Outcome:
+    - On a persistent connection, an inner block joins the outer block's
+      transaction: it neither commits nor rolls back on its own
+    - Without a persistent connection, each block commits independently
+    - Backfilling adds only the missing composite indexes, and leaves
+      foreign and already indexed databases untouched
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from database import DatabaseManager
+
+
+def make_db(db_path: str) -> DatabaseManager:
+    """Create a database with the schema, default metrics and one source."""
+    db_manager = DatabaseManager(db_path)
+    db_manager.initialize_schema()
+    db_manager.initialize_default_metrics()
+    db_manager.save_source("Port", "port")
+    return db_manager
+
+
+def insert_row(conn, timestamp: str):
+    """Insert one measurement row through an open connection."""
+    conn.execute(
+        "INSERT INTO measurements (timestamp, source_id, metric_id, value) "
+        "VALUES (?, 1, 1, '1.0')",
+        (timestamp,),
+    )
+
+
+def count_rows(db_manager: DatabaseManager) -> int:
+    """Number of stored measurement rows."""
+    with db_manager.get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
+
+
+class TestDatabaseManager:
+    """Test suite for DatabaseManager connection handling."""
+
+    def test_memory_database_is_persistent(self):
+        """
+        Verify a ':memory:' database keeps its data between blocks.
+        """
+        db_manager = make_db(":memory:")
+        with db_manager.get_connection() as conn:
+            insert_row(conn, "2025-09-01 00:00:00")
+
+        assert count_rows(db_manager) == 1
+
+    def test_nested_block_does_not_commit_outer_transaction(self):
+        """
+        Verify an outer failure also rolls back rows from a finished inner block.
+        """
+        db_manager = make_db(":memory:")
+
+        with pytest.raises(RuntimeError):
+            with db_manager.get_connection() as outer:
+                insert_row(outer, "2025-09-01 00:00:00")
+                with db_manager.get_connection() as inner:
+                    insert_row(inner, "2025-09-01 00:15:00")
+                raise RuntimeError("outer failed")
+
+        assert count_rows(db_manager) == 0
+
+    def test_nested_block_failure_leaves_rollback_to_outer(self):
+        """
+        Verify a failing inner block does not roll back the caller's open work.
+        """
+        db_manager = make_db(":memory:")
+
+        with db_manager.get_connection() as outer:
+            insert_row(outer, "2025-09-01 00:00:00")
+            with pytest.raises(RuntimeError):
+                with db_manager.get_connection():
+                    raise RuntimeError("inner failed")
+            insert_row(outer, "2025-09-01 00:15:00")
+
+        assert count_rows(db_manager) == 2
+
+    def test_file_database_commits_each_block(self, tmp_path):
+        """
+        Verify blocks on a file database without connect() commit independently.
+        """
+        db_manager = make_db(str(tmp_path / "blocks.db"))
+
+        with db_manager.get_connection() as conn:
+            insert_row(conn, "2025-09-01 00:00:00")
+        with pytest.raises(RuntimeError):
+            with db_manager.get_connection() as conn:
+                insert_row(conn, "2025-09-01 00:15:00")
+                raise RuntimeError("block failed")
+
+        assert count_rows(db_manager) == 1
+
+    def test_backfill_indexes_skips_foreign_database(self, tmp_path):
+        """
+        Verify backfilling leaves a database without simulator tables untouched.
+        """
+        db_path = tmp_path / "other.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE notes (body TEXT)")
+        conn.commit()
+        conn.close()
+
+        DatabaseManager(str(db_path)).backfill_indexes()
+
+        conn = sqlite3.connect(db_path)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        conn.close()
+        assert names == {"notes"}
+
+    def test_backfill_indexes_adds_composite_indexes(self, tmp_path):
+        """
+        Verify an older database gets the composite indexes and statistics.
+        """
+        db_path = str(tmp_path / "old.db")
+        db_manager = make_db(db_path)
+        with db_manager.get_connection() as conn:
+            conn.execute("DROP INDEX idx_measurements_cover")
+            conn.execute("DROP INDEX idx_measurements_source_timestamp")
+
+        with db_manager.get_connection() as conn:
+            assert DatabaseManager.missing_composite_indexes(conn) == [
+                "idx_measurements_source_timestamp",
+                "idx_measurements_cover",
+            ]
+
+        db_manager.backfill_indexes()
+
+        with db_manager.get_connection() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            assert DatabaseManager.missing_composite_indexes(conn) == []
+        assert {"idx_measurements_cover", "idx_measurements_source_timestamp"} <= names
+        assert "sqlite_stat1" in names
+
+    def test_backfill_indexes_leaves_indexed_database_untouched(self, tmp_path):
+        """
+        Verify a database that already has every index is not written to.
+        """
+        db_path = tmp_path / "current.db"
+        make_db(str(db_path))
+        before = db_path.read_bytes()
+
+        DatabaseManager(str(db_path)).backfill_indexes()
+
+        # No ANALYZE either, even though the database has no statistics yet
+        assert db_path.read_bytes() == before
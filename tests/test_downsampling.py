@@ -0,0 +1,111 @@
+"""
+Test: Viewer Downsampling
+
+Objective:
+    Confirm the viewer's LTTB and MinMaxLTTB downsampling keeps the points
+    a plot must show.
+
+Test Case:
+    Random-walk, noise and sine series longer than the plotting threshold
+    are downsampled, alongside short series and degenerate targets.
+
+Expected Outcome:
+    - Series at or below the threshold are returned unchanged
+    - The first and last points are always kept
+    - The global minimum and maximum survive MinMaxLTTB
+    - Targets of 2 points or fewer return every index instead of failing
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit_app import (
+    DOWNSAMPLE_THRESHOLD,
+    MAX_POINTS_PER_SERIES,
+    downsample,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def make_series(values: np.ndarray) -> pd.DataFrame:
+    """A one-minute series frame as load_data returns it."""
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2025-09-01", periods=len(values), freq="min"),
+            "value": values,
+        }
+    )
+
+
+def long_series(seed: int) -> np.ndarray:
+    """Random walk, noise or sine (by seed) longer than the threshold."""
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(DOWNSAMPLE_THRESHOLD + 1, 60_000))
+    kind = seed % 3
+    if kind == 0:
+        return np.cumsum(rng.normal(size=n))
+    if kind == 1:
+        return rng.normal(size=n)
+    return np.sin(np.arange(n) / 50) + rng.normal(size=n) * 0.1
+
+
+class TestDownsampling:
+    """Test suite for lttb_indices, minmax_indices and downsample."""
+
+    def test_short_series_unchanged(self):
+        """
+        Verify series at or below the threshold are not downsampled.
+        """
+        g = make_series(np.arange(DOWNSAMPLE_THRESHOLD, dtype=float))
+        assert downsample(g) is g
+
+        x = np.arange(10, dtype=float)
+        assert np.array_equal(lttb_indices(x, x, 10), np.arange(10))
+        assert np.array_equal(lttb_indices(x, x, 50), np.arange(10))
+
+    @pytest.mark.parametrize("seed", range(12))
+    def test_first_and_last_points_kept(self, seed):
+        """
+        Verify the ends of the series survive downsampling.
+        """
+        y = long_series(seed)
+        result = downsample(make_series(y))
+
+        assert result.index[0] == 0
+        assert result.index[-1] == len(y) - 1
+
+        idx = lttb_indices(np.arange(len(y), dtype=float), y, MAX_POINTS_PER_SERIES)
+        assert len(idx) == MAX_POINTS_PER_SERIES
+        assert idx[0] == 0 and idx[-1] == len(y) - 1
+
+    @pytest.mark.parametrize("seed", range(12))
+    def test_global_extrema_survive_minmax_lttb(self, seed):
+        """
+        Verify the global minimum and maximum are among the plotted points.
+        """
+        y = long_series(seed)
+        result = downsample(make_series(y))
+
+        assert y.argmin() in result.index
+        assert y.argmax() in result.index
+        assert len(result) <= MAX_POINTS_PER_SERIES + 2
+        assert result.index.is_monotonic_increasing
+
+        idx = minmax_indices(y, 100)
+        assert y.argmin() in idx and y.argmax() in idx
+
+    @pytest.mark.parametrize("n_out", [2, 1, 0])
+    def test_tiny_target_returns_all_points(self, n_out):
+        """
+        Verify LTTB with 2 or fewer output points returns every index.
+        """
+        x = np.arange(20, dtype=float)
+        y = np.sin(x)
+        assert np.array_equal(lttb_indices(x, y, n_out), np.arange(20))
@@ -0,0 +1,238 @@
+"""
+Test: Simulation Engine Persistence
+
+Objective:
+    Confirm the engine writes and reads back its rows reliably, whatever
+    the run ends with and wherever the database lives.
+
+Test Case:
+    A seeded 5-boat port is simulated in batch mode, including a run that
+    fails part-way through, an in-memory run dumped to disk at the end and
+    one that skips unchanged measurement values. The schedule replay is
+    given a timestep with several setpoints per charger.
+
+Expected Outcome:
+    - Every timestep simulated before a failure is stored in the database
+    - A failing final write does not hide the error that stopped the run
+    - An in-memory run dumps exactly the rows of a file-backed run
+    - Skipping unchanged values stores each change once, and forward-filling
+      the stored rows rebuilds the full per-timestep series
+    - Tied charger setpoints resolve to the first row written
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from models import Port, Boat, Charger
+from config import Settings, SimulationMode
+from database import DatabaseManager
+from simulation import SimulationEngine
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def make_engine(db_path: str, days: int = 1, **settings) -> SimulationEngine:
+    """Build a seeded 5-boat, 5-charger engine writing to db_path."""
+    port = Port(
+        name="Funchal",
+        contracted_power=80,
+        lat=32.64542,
+        lon=-16.90841,
+        tariff_path=str(PROJECT_ROOT / "assets" / "tariff" / "default_tariff.json"),
+    )
+    for i in range(5):
+        port.add_boat(
+            Boat(
+                name=f"SeaBreeze_{i + 1}",
+                motor_power=100,
+                weight=2500,
+                length=8.5,
+                battery_capacity=100,
+                range_speed=16.0,
+                soc=0.5,
+            )
+        )
+        port.add_charger(
+            Charger(name=f"FastCharger_{'ABCDE'[i]}", max_power=22, efficiency=0.95)
+        )
+
+    db_manager = DatabaseManager(db_path)
+    db_manager.initialize_schema()
+    db_manager.initialize_default_metrics()
+
+    return SimulationEngine(
+        port=port,
+        settings=Settings(
+            timestep=900,
+            mode=SimulationMode.BATCH,
+            db_path=db_path,
+            random_seed=42,
+            **settings,
+        ),
+        db_manager=db_manager,
+        start_date="2025-09-01",
+        days=days,
+        trips_directory=str(PROJECT_ROOT / "assets" / "trips"),
+    )
+
+
+def read_measurements(db_path: str) -> list:
+    """All measurement rows with source and metric names, in a stable order."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            """
+            SELECT d.timestamp, s.source_name, m.metric_name, d.value
+            FROM measurements d
+            JOIN source s USING (source_id)
+            JOIN metric m USING (metric_id)
+            ORDER BY 1, 2, 3, 4
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+class TestSimulationEngine:
+    """Test suite for the simulation engine's measurement storage."""
+
+    def test_failed_batch_run_keeps_completed_steps(self, tmp_path):
+        """
+        Verify rows buffered before an exception are still written.
+
+        Batch mode holds up to MEASUREMENT_FLUSH_SIZE rows in memory, so a
+        short run would lose all of them without the final flush.
+        """
+        db_path = str(tmp_path / "failed.db")
+        engine = make_engine(db_path)
+
+        completed_steps = 10
+        simulate_timestep = engine._simulate_timestep
+        calls = []
+
+        def failing_timestep():
+            if len(calls) == completed_steps:
+                raise RuntimeError("optimizer failed")
+            calls.append(engine.current_datetime)
+            simulate_timestep()
+
+        engine._simulate_timestep = failing_timestep
+
+        with pytest.raises(RuntimeError, match="optimizer failed"):
+            engine.run()
+
+        timestamps = {row[0] for row in read_measurements(db_path)}
+        assert len(timestamps) == completed_steps
+        assert min(timestamps) == calls[0].strftime("%Y-%m-%d %H:%M:%S")
+
+    def test_failed_flush_keeps_original_error(self, tmp_path, capsys):
+        """
+        Verify a flush that fails after a failed step does not hide the step's error.
+        """
+        engine = make_engine(str(tmp_path / "locked.db"))
+
+        def failing_timestep():
+            raise RuntimeError("optimizer failed")
+
+        def failing_save(table, records):
+            raise sqlite3.OperationalError("database is locked")
+
+        engine._simulate_timestep = failing_timestep
+        engine.pending_measurements = [("2025-09-01 00:00:00", 1, 1, "0.0")]
+        engine.db_manager.save_records_batch = failing_save
+
+        with pytest.raises(RuntimeError, match="optimizer failed"):
+            engine.run()
+        assert "database is locked" in capsys.readouterr().out
+
+    def test_in_memory_run_dumps_same_rows_as_file_run(self, tmp_path):
+        """
+        Verify an in-memory run with final_dump_path matches a file-backed run.
+        """
+        file_db = str(tmp_path / "file.db")
+        make_engine(file_db, days=2).run()
+
+        dump_db = str(tmp_path / "dump.db")
+        make_engine(":memory:", days=2, final_dump_path=dump_db).run()
+
+        file_rows = read_measurements(file_db)
+        assert len(file_rows) == 6336
+        assert read_measurements(dump_db) == file_rows
+
+    def test_skip_unchanged_measurements_stores_changes_only(self, tmp_path):
+        """
+        Verify skip_unchanged_measurements writes each value once per change,
+        and forward-filling rebuilds the full per-timestep series.
+        """
+        full_db = str(tmp_path / "full.db")
+        make_engine(full_db).run()
+        skip_db = str(tmp_path / "skip.db")
+        make_engine(skip_db, skip_unchanged_measurements=True).run()
+
+        full_rows = read_measurements(full_db)
+        skip_rows = read_measurements(skip_db)
+        assert len(skip_rows) < len(full_rows)
+
+        # Split both runs into per-(source, metric) series, in time order
+        def series(rows):
+            result = {}
+            for timestamp, source, metric, value in rows:
+                result.setdefault((source, metric), []).append((timestamp, value))
+            return result
+
+        full_series = series(full_rows)
+        skip_series = series(skip_rows)
+        assert skip_series.keys() == full_series.keys()
+
+        for key, full in full_series.items():
+            stored = skip_series[key]
+
+            # Repeated identical values are written once; every change is written
+            values = [value for _, value in stored]
+            assert all(a != b for a, b in zip(values, values[1:]))
+            full_changes = [full[0]] + [
+                point for prev, point in zip(full, full[1:]) if point[1] != prev[1]
+            ]
+            assert stored == full_changes
+
+            # Carrying the last stored value forward rebuilds every timestep
+            stored_by_time = dict(stored)
+            rebuilt, last = [], None
+            for timestamp, _ in full:
+                last = stored_by_time.get(timestamp, last)
+                rebuilt.append((timestamp, last))
+            assert rebuilt == full
+
+    def test_tied_setpoints_resolve_to_first_written_row(self, tmp_path):
+        """
+        Verify a charger with several setpoints at one timestep gets the first
+        one written, and a charger without a setpoint gets 0 kW.
+        """
+        engine = make_engine(str(tmp_path / "setpoints.db"))
+        db_manager = engine.db_manager
+        ts_str = "2025-09-01 09:00:00"
+        power_setpoint = db_manager.get_metric_id("power_setpoint")
+        charger_a = db_manager.get_or_create_source("FastCharger_A", "charger")
+        charger_b = db_manager.get_or_create_source("FastCharger_B", "charger")
+
+        # Interleave the two chargers' rows so neither comes back contiguous
+        db_manager.save_records_batch(
+            "scheduling",
+            [
+                (ts_str, charger_b, power_setpoint, "3.0"),
+                (ts_str, charger_a, power_setpoint, "5.0"),
+                (ts_str, charger_b, power_setpoint, "4.0"),
+                (ts_str, charger_a, power_setpoint, "7.0"),
+            ],
+        )
+
+        scheduled_power = engine._get_scheduled_charger_power(ts_str)
+
+        assert scheduled_power["FastCharger_A"] == 5.0
+        assert scheduled_power["FastCharger_B"] == 3.0
+        assert scheduled_power["FastCharger_C"] == 0.0
@@ -0,0 +1,80 @@
+"""
+Test: Trip Manager Reproducibility
+
+Objective:
+    Confirm seeded trip assignment is reproducible and independent per boat.
+
+Test Case:
+    Trips are assigned for two weeks from six routes, with the same seed,
+    by trip managers serving different sets of boats.
+
+Expected Outcome:
+    - Two managers with the same seed assign identical trips to every boat
+    - Adding or removing a boat does not change any other boat's trips
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from simulation.trip_manager import TripManager
+
+SEED = 42
+DAYS = 14
+START = datetime(2025, 9, 1)
+
+
+@pytest.fixture
+def trips_directory(tmp_path):
+    """Directory with six short route CSVs."""
+    for route in range(1, 7):
+        lines = ["timestamp,type,speed,heading,latitude,longitude"]
+        for minute in range(route + 1):
+            lines.append(f"2025-09-01 09:{minute:02d}:00.000000,Interpolated,10.0,0,32.6,-16.9")
+        (tmp_path / f"route_{route}.csv").write_text("\n".join(lines) + "\n")
+    return str(tmp_path)
+
+
+def assignments(manager: TripManager, boat_names: list) -> dict:
+    """Route names assigned to each boat per day, assigned day by day like the engine."""
+    result = {boat_name: [] for boat_name in boat_names}
+    for day in range(DAYS):
+        for boat_name in boat_names:
+            trips = manager.assign_daily_trips(boat_name, START + timedelta(days=day))
+            result[boat_name].append([trip.route_name for trip in trips])
+    return result
+
+
+class TestTripManager:
+    """Test suite for seeded TripManager assignments."""
+
+    def test_same_seed_assigns_same_trips(self, trips_directory):
+        """
+        Verify two managers with the same seed assign identical trips per boat.
+        """
+        boats = ["Boat_A", "Boat_B", "Boat_C"]
+        first = assignments(TripManager(trips_directory, seed=SEED), boats)
+        second = assignments(TripManager(trips_directory, seed=SEED), boats)
+
+        assert first == second
+        # The check is only meaningful if boats actually get different trips
+        assert len({str(trips) for trips in first.values()}) > 1
+
+    def test_fleet_changes_do_not_affect_other_boats(self, trips_directory):
+        """
+        Verify adding or removing a boat leaves the other boats' trips unchanged.
+        """
+        fleet = assignments(TripManager(trips_directory, seed=SEED), ["Boat_A", "Boat_B", "Boat_C"])
+        without_b = assignments(TripManager(trips_directory, seed=SEED), ["Boat_A", "Boat_C"])
+        with_d = assignments(
+            TripManager(trips_directory, seed=SEED), ["Boat_D", "Boat_A", "Boat_B", "Boat_C"]
+        )
+
+        for boat_name in ("Boat_A", "Boat_C"):
+            assert without_b[boat_name] == fleet[boat_name]
+        for boat_name in ("Boat_A", "Boat_B", "Boat_C"):
+            assert with_d[boat_name] == fleet[boat_name]
@@ -0,0 +1,78 @@
+"""
+Test: Trip Model Point Lookup
+
+Objective:
+    Confirm a trip returns the route point closest to a given elapsed time.
+
+Test Case:
+    A trip with points 0 s, 10 s, 20 s and 40 s after departure is queried
+    at exact point times, halfway between points and outside the trip.
+
+Expected Outcome:
+    - An exact time returns that point
+    - A time halfway between two points returns the earlier point
+    - A time before departure returns the first point
+    - A time after arrival returns None
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from models.trip import Trip
+
+# Seconds after departure of each route point
+POINT_OFFSETS = (0, 10, 20, 40)
+
+
+@pytest.fixture
+def trip(tmp_path):
+    """A four-point trip loaded from CSV."""
+    csv_path = tmp_path / "route_test.csv"
+    lines = ["timestamp,type,speed,heading,latitude,longitude"]
+    for i, offset in enumerate(POINT_OFFSETS):
+        lines.append(f"2025-09-01 09:00:{offset:02d}.000000,Interpolated,{i + 1}.0,0,32.6,-16.9")
+    csv_path.write_text("\n".join(lines) + "\n")
+    return Trip(str(csv_path))
+
+
+class TestTripModel:
+    """Test suite for Trip.get_point_at_elapsed_time."""
+
+    def test_exact_hit(self, trip):
+        """
+        Verify a time equal to a point's offset returns that point.
+        """
+        for i, offset in enumerate(POINT_OFFSETS):
+            assert trip.get_point_at_elapsed_time(offset) is trip.points[i]
+
+    def test_tie_resolves_to_earlier_point(self, trip):
+        """
+        Verify a time equally far from two points returns the earlier one.
+        """
+        assert trip.get_point_at_elapsed_time(5) is trip.points[0]
+        assert trip.get_point_at_elapsed_time(30) is trip.points[2]
+
+    def test_closest_point_between_points(self, trip):
+        """
+        Verify a time between two points returns the nearer one.
+        """
+        assert trip.get_point_at_elapsed_time(4.9) is trip.points[0]
+        assert trip.get_point_at_elapsed_time(5.1) is trip.points[1]
+        assert trip.get_point_at_elapsed_time(31) is trip.points[3]
+
+    def test_before_first_point(self, trip):
+        """
+        Verify a time before departure returns the first point.
+        """
+        assert trip.get_point_at_elapsed_time(-5) is trip.points[0]
+
+    def test_after_last_point(self, trip):
+        """
+        Verify a time past the last point returns None.
+        """
+        assert trip.duration == POINT_OFFSETS[-1]
+        assert trip.get_point_at_elapsed_time(POINT_OFFSETS[-1] + 1) is None
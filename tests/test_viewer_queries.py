@@ -0,0 +1,72 @@
+"""
+Test: Viewer Data Queries
+
+Objective:
+    Confirm the viewer's data query reads stored values as numbers without
+    turning non-numeric values into real data.
+
+Test Case:
+    A measurements table holds numeric text, integer and real values next to
+    non-numeric text, and is read raw and per 15-minute bucket.
+
+Expected Outcome:
+    - Numeric values come back as floats
+    - Non-numeric values come back as NULL (NaN in pandas)
+    - Bucket mean, min and max ignore non-numeric values
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from streamlit_app import load_data_query
+
+TIMESTAMP = "2025-09-01 09:00:00"
+VALUES = ("2.5", "-1", 4, 6.0, "n/a", "", "nan")
+
+
+@pytest.fixture
+def conn():
+    """In-memory measurements table with one series of mixed values."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE measurements (timestamp TEXT, source_id INTEGER, metric_id INTEGER, value)"
+    )
+    conn.executemany(
+        "INSERT INTO measurements VALUES (?, 1, 1, ?)",
+        [(TIMESTAMP, value) for value in VALUES],
+    )
+    yield conn
+    conn.close()
+
+
+class TestViewerQueries:
+    """Test suite for load_data_query value handling."""
+
+    def test_raw_values_keep_non_numeric_as_null(self, conn):
+        """
+        Verify raw rows return numeric values as floats and the rest as NULL.
+        """
+        query = load_data_query(("measurements",), False, False, False, False)
+        values = [row[-1] for row in conn.execute(query)]
+
+        assert sorted(values, key=lambda v: (v is None, v)) == [
+            -1.0, 2.5, 4.0, 6.0, None, None, None
+        ]
+
+    def test_buckets_ignore_non_numeric_values(self, conn):
+        """
+        Verify per-bucket mean, min and max only aggregate numeric values.
+        """
+        query = load_data_query(("measurements",), False, False, False, False, True)
+        rows = conn.execute(query, [900, 900]).fetchall()
+
+        assert len(rows) == 1
+        timestamp, _, _, _, mean, low, high = rows[0]
+        assert timestamp == TIMESTAMP
+        assert mean == pytest.approx((2.5 - 1 + 4 + 6) / 4)
+        assert (low, high) == (-1.0, 6.0)